@@ -1,12 +1,31 @@
+import time
+STARTED = time.perf_counter()   # for the startup benchmark, before the slow imports
+
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk
 from PIL import Image, ImageTk, ImageDraw, ImageFilter, ImageFont
+import argparse
 import random
-import winsound
-import time
-import io
+import hashlib
+import os
+from functools import lru_cache
+
+# PAGE SETTINGS
+WARM_UP_DELAY = 200   # ms after start before the other pages are built
+SLIDE_TIME = 300      # ms for a page to slide in
+FRAME_TIME = 16       # ms between animation frames, about 60 a second
+
+# BACKGROUND SETTINGS
+BG_STEP = 16          # backgrounds are made in 16px steps, so nearby sizes share one
+BG_CACHE_SIZE = 8     # how many rendered backgrounds to keep
+BG_DELAY = 120        # ms without resizing before the background is redrawn
+GLOW_SCALE = 8        # the glow is drawn this many times smaller, then scaled up
 
 # GENERATE NEON BACKGROUND IMAGE
+# Cached by size. The glow is a blurred circle with no detail left in it,
+# so blurring a small copy and scaling it up looks the same and is far
+# cheaper than blurring at full size.
+@lru_cache(maxsize=BG_CACHE_SIZE)
 def create_neon_background(size):
     w, h = size
     img = Image.new("RGBA", size, (5, 5, 10, 255))
@@ -19,11 +38,12 @@ def create_neon_background(size):
     for j in range(0, h, step):
         draw.line([(0, j), (w, j)], fill=grid_color, width=1)
 
-    glow_size = min(w, h) // 3
-    glow_center_x = w // 2
-    glow_center_y = h // 2
+    small_size = (max(w // GLOW_SCALE, 1), max(h // GLOW_SCALE, 1))
+    glow_size = min(w, h) / 3 / GLOW_SCALE
+    glow_center_x = small_size[0] / 2
+    glow_center_y = small_size[1] / 2
 
-    glow_layer = Image.new("RGBA", size, (0, 0, 0, 0))
+    glow_layer = Image.new("RGBA", small_size, (0, 0, 0, 0))
     glow_draw = ImageDraw.Draw(glow_layer)
 
     glow_draw.ellipse(
@@ -32,10 +52,14 @@ def create_neon_background(size):
         fill=(0, 255, 255, 60)
     )
 
-    glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=50))
-    img.alpha_composite(glow_layer, (0, 0))
+    glow_layer = glow_layer.filter(ImageFilter.GaussianBlur(radius=50 / GLOW_SCALE))
+    img.alpha_composite(glow_layer.resize(size, Image.BILINEAR), (0, 0))
     return ImageTk.PhotoImage(img)
 
+# SLIDE EASING: fast at first, settling gently into place
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
 # LOAD JOKES
 def load_jokes():
     all_jokes = [
@@ -55,13 +79,64 @@ def load_jokes():
         jokes_by_genre.setdefault(genre, []).append((setup, punch))
     return jokes_by_genre
 
+# BUTTON SPRITE SETTINGS
+# Rendered buttons are also saved as PNGs here, so the next start skips
+# the blur. Set to None to keep them in memory only.
+SPRITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "button_cache")
+SPRITE_VERSION = 1    # bump when the drawing below changes, old PNGs are then ignored
+
+# FONT LOADER
+@lru_cache(maxsize=None)
+def load_font(size=22):
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        return ImageFont.load_default()
+
 # NEON BUTTON IMAGE CREATOR
+# One pair of images per (text, size, neon_color) for the whole program,
+# so the two Back buttons share theirs.
+@lru_cache(maxsize=None)
 def make_button_images(text, size=(240, 60), neon_color=(0, 255, 255)):
-    w, h = size
+    img, final_glow = load_button_sprites(text, size, neon_color)
+    return ImageTk.PhotoImage(img), ImageTk.PhotoImage(final_glow)
+
+
+def sprite_paths(text, size, neon_color):
+    key = repr((SPRITE_VERSION, text, size, neon_color)).encode("utf-8")
+    name = hashlib.sha1(key).hexdigest()[:20]
+    return (os.path.join(SPRITE_DIR, name + "-normal.png"),
+            os.path.join(SPRITE_DIR, name + "-glow.png"))
+
+
+def load_button_sprites(text, size, neon_color):
+    if SPRITE_DIR is None:
+        return render_button_sprites(text, size, neon_color)
+
+    normal_path, glow_path = sprite_paths(text, size, neon_color)
+    try:
+        with Image.open(normal_path) as normal, Image.open(glow_path) as glow:
+            return normal.convert("RGBA"), glow.convert("RGBA")
+    except OSError:
+        pass
+
+    img, final_glow = render_button_sprites(text, size, neon_color)
+
+    # the cache is only a speed-up, so a folder we cannot write to is fine
     try:
-        font = ImageFont.truetype("arial.ttf", 22)
-    except:
-        font = ImageFont.load_default()
+        os.makedirs(SPRITE_DIR, exist_ok=True)
+        for image, path in ((img, normal_path), (final_glow, glow_path)):
+            temp_path = path + ".tmp"
+            image.save(temp_path, "PNG")
+            os.replace(temp_path, path)
+    except OSError:
+        pass
+    return img, final_glow
+
+
+def render_button_sprites(text, size, neon_color):
+    w, h = size
+    font = load_font()
 
     base_color = (15, 15, 25, 255)
 
@@ -81,7 +156,7 @@ def make_button_images(text, size=(240, 60), neon_color=(0, 255, 255)):
     final_glow.alpha_composite(img)
     final_glow.alpha_composite(glow)
 
-    return ImageTk.PhotoImage(img), ImageTk.PhotoImage(final_glow)
+    return img, final_glow
 
 # CUSTOM NEON MESSAGEBOX
 def neon_messagebox(title, message):
@@ -125,6 +200,8 @@ class JokeApp(tk.Tk):
         self.current_genre = tk.StringVar(value="General")
 
         self.bg_image = None
+        self.bg_size = None
+        self.bg_job = None
         
        #CODE TO CHANGE ICON IS ADDED HERE.
         icon_path = "tom.png" 
@@ -146,19 +223,61 @@ class JokeApp(tk.Tk):
         self.container = tk.Frame(self, bg="#050510")
         self.container.place(relwidth=1, relheight=1)
 
+        # Only the start page is built before the window first shows. The
+        # others are built on first use, or one at a time while idle.
         self.frames = {}
-        for F in (StartPage, JokePage, InstructionPage):
-            page = F(self.container, self)
-            self.frames[F] = page
-            page.place(relwidth=1, relheight=1)
+        self.page_classes = (StartPage, JokePage, InstructionPage)
+        self.current_page = None
+        self.slide = None     # the running transition: frame, previous, start, job
 
         self.bind("<Configure>", self.update_background)
+        self.bind("<Escape>", lambda e: self.cancel_slide())
 
         self.show_frame(StartPage, first=True)
-
+        self.after(WARM_UP_DELAY, self.warm_up)
+
+    def get_page(self, page):
+        frame = self.frames.get(page)
+        if frame is None:
+            frame = page(self.container, self)
+            self.frames[page] = frame
+            frame.place(relwidth=1, relheight=1)
+            # a new frame stacks on top, keep it under the page on show
+            frame.lower()
+            if self.bg_image is not None:
+                frame.bg_label.config(image=self.bg_image)
+                frame.bg_label.image = self.bg_image
+        return frame
+
+    # builds one missing page per idle pass, so clicks and redraws still
+    # get through in between
+    def warm_up(self):
+        for page in self.page_classes:
+            if page not in self.frames:
+                self.get_page(page)
+                self.after_idle(self.warm_up)
+                return
+
+    # A resize sends a stream of <Configure> events, from the window and
+    # from every widget inside it. Only the window's own events count, and
+    # the redraw waits until they stop for BG_DELAY ms.
     def update_background(self, event=None):
-        w = self.winfo_width()
-        h = self.winfo_height()
+        if event is not None and event.widget is not self:
+            return
+
+        if self.bg_job is not None:
+            self.after_cancel(self.bg_job)
+        self.bg_job = self.after(BG_DELAY, self.redraw_background)
+
+    def redraw_background(self):
+        self.bg_job = None
+
+        # round up, so the background always covers the window
+        w = -(-max(self.winfo_width(), 1) // BG_STEP) * BG_STEP
+        h = -(-max(self.winfo_height(), 1) // BG_STEP) * BG_STEP
+        if (w, h) == self.bg_size:
+            return
+        self.bg_size = (w, h)
         self.bg_image = create_neon_background((w, h))
 
         for frame in self.frames.values():
@@ -166,21 +285,62 @@ class JokeApp(tk.Tk):
                 frame.bg_label.config(image=self.bg_image)
                 frame.bg_label.image = self.bg_image
 
+    # Pages slide in from the right on after() callbacks, so the window
+    # keeps handling input while they move. The position comes from the
+    # time since the slide began and the window's width at that moment, so
+    # a slow frame or a resize mid-slide cannot throw it off. A new
+    # show_frame finishes any running slide first, so clicks never stack.
     def show_frame(self, page, first=False):
-        current_frame = self.frames.get(JokePage)
-        next_frame = self.frames[page]
+        next_frame = self.get_page(page)
+        self.finish_slide()
 
-        if first:
+        if first or next_frame is self.current_page:
+            next_frame.place(x=0, y=0)
             next_frame.lift()
+            self.current_page = next_frame
             return
 
-        next_frame.place(x=700, y=0)
+        next_frame.place(x=self.container.winfo_width(), y=0)
         next_frame.lift()
+        self.slide = {"frame": next_frame, "previous": self.current_page,
+                      "start": time.perf_counter(), "job": None}
+        self.current_page = next_frame
+        self.slide_step()
+
+    def slide_step(self):
+        slide = self.slide
+        t = min((time.perf_counter() - slide["start"]) * 1000 / SLIDE_TIME, 1)
+        width = self.container.winfo_width()
+        slide["frame"].place(x=round(width * (1 - ease_out_cubic(t))), y=0)
+
+        if t < 1:
+            slide["job"] = self.after(FRAME_TIME, self.slide_step)
+        else:
+            self.slide = None
 
-        for x in range(700, 0, -100):
-            next_frame.place(x=x, y=0)
-            next_frame.update()
-        next_frame.place(x=0, y=0)
+    # jump the running slide to its end
+    def finish_slide(self):
+        if self.slide is None:
+            return
+        if self.slide["job"] is not None:
+            self.after_cancel(self.slide["job"])
+        self.slide["frame"].place(x=0, y=0)
+        self.slide = None
+
+    # stop the running slide and go back to the page it started from
+    def cancel_slide(self):
+        if self.slide is None:
+            return
+        slide = self.slide
+        if slide["job"] is not None:
+            self.after_cancel(slide["job"])
+        self.slide = None
+
+        slide["frame"].place(x=0, y=0)
+        slide["frame"].lower()
+        if slide["previous"] is not None:
+            slide["previous"].lift()
+        self.current_page = slide["previous"]
 
     def random_joke(self, genre=None):
         if genre is None or genre not in self.jokes_by_genre:
@@ -358,8 +518,47 @@ class JokePage(tk.Frame):
         neon_messagebox("Punchline 🤣", punch)
         
 
+# ----------------------------------------------------
+# STARTUP BENCHMARK
+# ----------------------------------------------------
+# python randomJokes.py --benchmark [--no-disk-cache]
+# Times the imports, building the app, the first paint, and the idle
+# warm-up of the other pages. Run it as a fresh process each time.
+def benchmark(disk_cache=True):
+    global SPRITE_DIR
+    if not disk_cache:
+        SPRITE_DIR = None
+
+    imported = time.perf_counter()
+    app = JokeApp()
+    built = time.perf_counter()
+    app.update()
+    painted = time.perf_counter()
+
+    while len(app.frames) < len(app.page_classes):
+        app.update()
+        time.sleep(0.001)
+    warmed = time.perf_counter()
+    app.destroy()
+
+    print(f"imports          {(imported - STARTED) * 1000:8.1f} ms")
+    print(f"build app        {(built - imported) * 1000:8.1f} ms")
+    print(f"first paint      {(painted - STARTED) * 1000:8.1f} ms since start")
+    print(f"all pages ready  {(warmed - STARTED) * 1000:8.1f} ms since start")
+
 # ----------------------------------------------------
 # RUN APP
 # ----------------------------------------------------
 if __name__ == "__main__":
-    JokeApp().mainloop()
+    parser = argparse.ArgumentParser(description="Alexa Advanced Joke Assistant")
+    parser.add_argument("--benchmark", action="store_true", help="time the start-up and exit")
+    parser.add_argument("--no-disk-cache", action="store_true",
+                        help="render every button instead of reading saved ones")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(disk_cache=not args.no_disk_cache)
+    else:
+        if args.no_disk_cache:
+            SPRITE_DIR = None
+        JokeApp().mainloop()
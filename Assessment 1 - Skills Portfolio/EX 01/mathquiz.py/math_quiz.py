@@ -1,20 +1,42 @@
 import tkinter as tk
 from tkinter import messagebox
 from PIL import Image, ImageTk
-import random
+from collections import OrderedDict
+import time
+from question_engine import PROFILES, ROUND_LENGTH, AdaptiveEngine, QuestionEngine, Rating
+from quiz_log import QuizLog, format_date
+from quiz_timing import Timings
+from quiz_scoring import ASKING, CORRECT, FIRST_TRY_POINTS, TRY_AGAIN, WRONG, QuizRound
 
-# SCORE BOARD SECTION
-score = 0
-question_count = 0
-correct_answer = 0
-attempt = 1
-difficulty = "Easy"
+# BACKGROUND RESIZING SETTINGS
+BG_STEP = 16            # cached backgrounds are sized in 16px steps
+BG_CACHE_SIZE = 8       # how many resized backgrounds to keep
+BG_PREVIEW_DELAY = 30   # ms between quick redraws while dragging
+BG_SETTLE_DELAY = 200   # ms without resizing before the sharp redraw
+
+# Adaptive mode follows the player's rating instead of a fixed profile
+ADAPTIVE = "Adaptive"
+LEVELS = list(PROFILES) + [ADAPTIVE]
+
+# TIMING OVERLAY (F2 shows it, F3 saves the samples as JSON)
+OVERLAY_REFRESH = 500   # ms between overlay updates
 
 
 # MAIN CLASS SECTION
 class MathQuiz:
-    def __init__(self, root):
+    def __init__(self, root, seed=None):
         self.root = root
+        self.engine = QuestionEngine(seed)
+        self.quiz = None
+        self.level = None
+        self.adaptive = None
+        self.step = 0
+        self.player = "Player"
+        self.started = 0.0
+        self.asked_at = 0.0
+        self.log = QuizLog()
+        self.timings = Timings()
+        self.overlay_job = None
         self.root.title("Math Quiz")
 
         # FULLSCREEN & RESIZABLE
@@ -23,76 +45,150 @@ class MathQuiz:
 
         # Resize event
         self.root.bind("<Configure>", self.resize_bg)
+        self.bg_cache = OrderedDict()
+        self.bg_size = None
+        self.preview_job = None
+        self.settle_job = None
 
         # LOAD BACKGROUND
-        self.original_bg = Image.open("download.jpeg")   # Your background image
+        self.original_bg = Image.open("download.jpeg").convert("RGB")   # Your background image
+        # no window is bigger than the screen, so shrink the source once
+        self.original_bg.thumbnail(
+            (self.root.winfo_screenwidth(), self.root.winfo_screenheight()), Image.LANCZOS)
         self.bg_photo = ImageTk.PhotoImage(self.original_bg)
 
         self.bg_label = tk.Label(self.root, image=self.bg_photo)
         self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
         # Start app
+        self.build_screens()
+        self.build_overlay()
         self.main_menu()
 
     # RESIZE BACKGROUND
+    # A drag-resize sends a stream of <Configure> events. They are collapsed
+    # into a quick low-quality redraw every BG_PREVIEW_DELAY ms, then one
+    # sharp redraw once the size stops changing. Both are cached by size.
     def resize_bg(self, event):
-        try:
-            resized = self.original_bg.resize((event.width, event.height))
-            self.bg_photo = ImageTk.PhotoImage(resized)
-            self.bg_label.config(image=self.bg_photo)
-        except:
-            pass
-
-    # CLEAR SCREEN
-    def clear(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-        # Re-add background
-        self.bg_label = tk.Label(self.root, image=self.bg_photo)
-        self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+        # the binding on root also sees every child widget's events
+        if event.widget is not self.root:
+            return
 
-    # MAIN MENU
-    def main_menu(self):
-        self.clear()
+        size = (max(event.width, 1), max(event.height, 1))
+        if size == self.bg_size:
+            return
+        self.bg_size = size
+
+        if self.preview_job is None:
+            self.preview_job = self.root.after(BG_PREVIEW_DELAY, self.preview_bg)
+        if self.settle_job is not None:
+            self.root.after_cancel(self.settle_job)
+        self.settle_job = self.root.after(BG_SETTLE_DELAY, self.settle_bg)
+
+    def preview_bg(self):
+        self.preview_job = None
+        with self.timings.measure("ui background preview"):
+            self.show_bg(Image.BILINEAR)
+
+    def settle_bg(self):
+        self.settle_job = None
+        with self.timings.measure("ui background sharp"):
+            self.show_bg(Image.LANCZOS)
+
+    def show_bg(self, quality):
+        # round up, so the picture always covers the window
+        w, h = (-(-n // BG_STEP) * BG_STEP for n in self.bg_size)
+        key = (w, h, quality)
+
+        photo = self.bg_cache.get(key)
+        if photo is None:
+            photo = ImageTk.PhotoImage(self.original_bg.resize((w, h), quality))
+            self.bg_cache[key] = photo
+            if len(self.bg_cache) > BG_CACHE_SIZE:
+                self.bg_cache.popitem(last=False)
+        else:
+            self.bg_cache.move_to_end(key)
+
+        self.bg_photo = photo
+        self.bg_label.config(image=photo)
+
+    # SCREENS
+    # Every screen is built once in build_screens as a list of widgets and
+    # where to place them. The widgets sit straight on root (a frame would
+    # hide the background), so switching screens only un-places the old
+    # widgets and places the new ones. Nothing is destroyed or rebuilt.
+    def add(self, screen, widget, **place):
+        self.screens.setdefault(screen, []).append((widget, place))
+        return widget
+
+    def show(self, screen):
+        if screen == self.current:
+            return
+        with self.timings.measure("ui show screen"):
+            if self.current:
+                for widget, place in self.screens[self.current]:
+                    widget.place_forget()
+            for widget, place in self.screens[screen]:
+                widget.place(**place)
+            self.current = screen
+
+    def build_screens(self):
+        self.screens = {}
+        self.current = None
+        self.build_main_menu()
+        self.build_how_it_works()
+        self.build_select_difficulty()
+        self.build_quiz()
+        self.build_results()
+        self.build_leaderboard()
+        self.build_history()
 
-        tk.Label(
+    # MAIN MENU
+    def build_main_menu(self):
+        self.add("menu", tk.Label(
             self.root,
             text="MATH QUIZ",
             font=("Arial", 40, "bold"),
             fg="yellow",
             bg="#000000"
-        ).place(relx=0.5, rely=0.18, anchor="center")
+        ), relx=0.5, rely=0.18, anchor="center")
 
-        tk.Button(
+        self.add("menu", tk.Button(
             self.root, text="Start Quiz",
             font=("Arial", 26), bg="yellow", fg="black",
             command=self.select_difficulty
-        ).place(relx=0.5, rely=0.40, anchor="center")
+        ), relx=0.5, rely=0.36, anchor="center")
 
-        tk.Button(
+        self.add("menu", tk.Button(
             self.root, text="How It Works",
             font=("Arial", 22), bg="yellow", fg="black",
             command=self.how_it_works
-        ).place(relx=0.5, rely=0.52, anchor="center")
+        ), relx=0.5, rely=0.47, anchor="center")
 
-        tk.Button(
+        self.add("menu", tk.Button(
+            self.root, text="Leaderboard",
+            font=("Arial", 22), bg="yellow", fg="black",
+            command=lambda: self.leaderboard("Easy")
+        ), relx=0.5, rely=0.57, anchor="center")
+
+        self.add("menu", tk.Button(
             self.root, text="Exit",
             font=("Arial", 22), bg="red", fg="white",
             command=self.root.quit
-        ).place(relx=0.5, rely=0.63, anchor="center")
+        ), relx=0.5, rely=0.67, anchor="center")
 
-    # HOW IT WORKS PAGE
-    def how_it_works(self):
-        self.clear()
+    def main_menu(self):
+        self.show("menu")
 
-        tk.Label(
+    # HOW IT WORKS PAGE
+    def build_how_it_works(self):
+        self.add("how", tk.Label(
             self.root,
             text="HOW THE MATH QUIZ WORKS",
             font=("Arial", 40, "bold"),
             fg="yellow",
             bg="#000"
-        ).place(relx=0.5, rely=0.15, anchor="center")
+        ), relx=0.5, rely=0.15, anchor="center")
 
         instructions = (
             " Welcome to the Math Quiz!\n\n"
@@ -108,232 +204,349 @@ class MathQuiz:
             " Good luck!"
         )
 
-        tk.Label(
+        self.add("how", tk.Label(
             self.root,
             text=instructions,
             font=("Arial", 22),
             fg="white",
             bg="#000",
             justify="left"
-        ).place(relx=0.5, rely=0.55, anchor="center")
+        ), relx=0.5, rely=0.55, anchor="center")
 
-        tk.Button(
+        self.add("how", tk.Button(
             self.root,
             text="Back",
             font=("Arial", 22),
             bg="yellow",
             fg="black",
             command=self.main_menu
-        ).place(relx=0.5, rely=0.87, anchor="center")
+        ), relx=0.5, rely=0.87, anchor="center")
 
-    # SELECT DIFFICULTY
-    def select_difficulty(self):
-        self.clear()
+    def how_it_works(self):
+        self.show("how")
 
-        tk.Label(
+    # SELECT DIFFICULTY
+    def build_select_difficulty(self):
+        self.add("difficulty", tk.Label(
             self.root, text="Select Difficulty Level",
             font=("Arial", 36, "bold"), fg="yellow",
             bg="#000"
-        ).place(relx=0.5, rely=0.18, anchor="center")
+        ), relx=0.5, rely=0.18, anchor="center")
+
+        self.add("difficulty", tk.Label(
+            self.root, text="Your name:", font=("Arial", 22),
+            fg="white", bg="#000"
+        ), relx=0.42, rely=0.29, anchor="center")
 
-        tk.Button(
+        self.name_entry = self.add("difficulty", tk.Entry(
+            self.root, font=("Arial", 22), width=14, justify="center"
+        ), relx=0.56, rely=0.29, anchor="center")
+        self.name_entry.insert(0, self.player)
+
+        self.add("difficulty", tk.Button(
             self.root, text="Easy (1–9)", font=("Arial", 26),
             bg="yellow", command=lambda: self.start_quiz("Easy")
-        ).place(relx=0.5, rely=0.40, anchor="center")
+        ), relx=0.5, rely=0.38, anchor="center")
 
-        tk.Button(
+        self.add("difficulty", tk.Button(
             self.root, text="Moderate (10–99)", font=("Arial", 26),
             bg="yellow", command=lambda: self.start_quiz("Moderate")
-        ).place(relx=0.5, rely=0.50, anchor="center")
+        ), relx=0.5, rely=0.47, anchor="center")
 
-        tk.Button(
+        self.add("difficulty", tk.Button(
             self.root, text="Advanced (100–9999)", font=("Arial", 26),
             bg="yellow", command=lambda: self.start_quiz("Advanced")
-        ).place(relx=0.5, rely=0.60, anchor="center")
+        ), relx=0.5, rely=0.56, anchor="center")
+
+        self.add("difficulty", tk.Button(
+            self.root, text="Adaptive (follows you)", font=("Arial", 26),
+            bg="yellow", command=lambda: self.start_quiz(ADAPTIVE)
+        ), relx=0.5, rely=0.65, anchor="center")
 
-        tk.Button(
+        self.add("difficulty", tk.Button(
             self.root, text="Exit", font=("Arial", 22),
             bg="red", fg="white", command=self.root.quit
-        ).place(relx=0.5, rely=0.75, anchor="center")
+        ), relx=0.5, rely=0.77, anchor="center")
 
-    # START QUIZ
-    def start_quiz(self, level):
-        global score, question_count, attempt, difficulty
-
-        self.clear()
-
-        score = 0
-        question_count = 0
-        difficulty = level
-        attempt = 1
+    def select_difficulty(self):
+        self.show("difficulty")
 
-        self.q_label = tk.Label(
+    # QUIZ SCREEN
+    def build_quiz(self):
+        self.q_label = self.add("quiz", tk.Label(
             self.root, text="", font=("Arial", 36, "bold"),
             fg="yellow", bg="#000"
-        )
-        self.q_label.place(relx=0.5, rely=0.20, anchor="center")
+        ), relx=0.5, rely=0.20, anchor="center")
 
-        self.score_label = tk.Label(
+        self.score_label = self.add("quiz", tk.Label(
             self.root, text="Score: 0",
             font=("Arial", 26), fg="white", bg="#000"
-        )
-        self.score_label.place(relx=0.85, rely=0.10, anchor="center")
+        ), relx=0.85, rely=0.10, anchor="center")
 
-        self.answer = tk.Entry(
+        self.answer = self.add("quiz", tk.Entry(
             self.root, font=("Arial", 30),
             width=10, justify="center"
-        )
-        self.answer.place(relx=0.5, rely=0.40, anchor="center")
+        ), relx=0.5, rely=0.40, anchor="center")
 
-        tk.Button(
+        self.add("quiz", tk.Button(
             self.root, text="Submit", font=("Arial", 26),
             bg="yellow", fg="black", command=self.check_answer
-        ).place(relx=0.5, rely=0.50, anchor="center")
+        ), relx=0.5, rely=0.50, anchor="center")
 
-        tk.Button(
+        self.add("quiz", tk.Button(
             self.root, text="Exit", font=("Arial", 16),
             bg="red", fg="white", command=self.root.quit
-        ).place(relx=0.90, rely=0.93, anchor="center")
+        ), relx=0.90, rely=0.93, anchor="center")
 
-        self.feedback = tk.Label(
+        self.feedback = self.add("quiz", tk.Label(
             self.root, text="", font=("Arial", 26),
             fg="white", bg="#000"
-        )
-        self.feedback.place(relx=0.5, rely=0.60, anchor="center")
+        ), relx=0.5, rely=0.60, anchor="center")
+
+    # START QUIZ
+    def start_quiz(self, level):
+        self.level = level
+        self.player = self.name_entry.get().strip() or "Player"
+        self.started = time.time()
+
+        if level == ADAPTIVE:
+            # questions are picked one at a time in new_question
+            saved = self.log.load_rating(self.player)
+            rating = Rating(*saved) if saved else Rating()
+            self.adaptive = AdaptiveEngine(rating, self.engine.random.getrandbits(32))
+            self.quiz = QuizRound([None] * ROUND_LENGTH)
+        else:
+            self.adaptive = None
+            self.quiz = QuizRound(self.engine.round(level))
 
+        self.score_label.config(text=self.score_text())
+        self.show("quiz")
+        self.answer.focus_set()
         self.new_question()
 
     # NEW QUESTION
     def new_question(self):
-        global correct_answer, question_count, attempt
+        self.quiz.next_question()
 
-        question_count += 1
-        attempt = 1
+        if self.adaptive:
+            asked = {q.key() for q in self.quiz.questions[:self.quiz.index]}
+            question, self.step = self.adaptive.question(avoid=asked)
+            self.quiz.set_question(question)
 
-        if difficulty == "Easy":
-            a = random.randint(1, 9)
-            b = random.randint(1, 9)
-        elif difficulty == "Moderate":
-            a = random.randint(10, 99)
-            b = random.randint(10, 99)
-        else:
-            a = random.randint(100, 9999)
-            b = random.randint(1, 50)
-
-        op = random.choice(["+", "-", "*"])
-
-        if op == "+":
-            correct_answer = a + b
-        elif op == "-":
-            correct_answer = a - b
-        else:
-            correct_answer = a * b
-
-        self.q_label.config(text=f"{a} {op} {b} = ?")
+        self.q_label.config(text=self.quiz.question().text())
         self.answer.delete(0, tk.END)
         self.feedback.config(text="")
+        self.asked_at = self.timings.now()
 
     # CHECK ANSWER
     def check_answer(self):
-        global score, attempt, question_count
+        # between questions the feedback stays up and Submit does nothing
+        if self.quiz.state != ASKING:
+            return
 
         try:
             user = int(self.answer.get())
-        except:
+        except ValueError:
             self.feedback.config(text="Enter a valid number!", fg="red")
             return
 
-        if user == correct_answer:
-            if attempt == 1:
-                score += 10
-                self.feedback.config(text="Correct! +10 🦇", fg="yellow")
-            else:
-                score += 5
-                self.feedback.config(text="Correct! +5 🦇", fg="lightgreen")
+        # from the question appearing to this submission
+        seconds = self.timings.now() - self.asked_at
+        question = self.quiz.question()
+        self.timings.record(f"answer {self.level} {question.op}", seconds)
+        outcome, points = self.quiz.answer(user, seconds)
+
+        if self.adaptive and outcome in (CORRECT, WRONG):
+            self.rate_answer(points, seconds)
 
-            self.score_label.config(text=f"Score: {score}")
+        if outcome == CORRECT:
+            colour = "yellow" if points == FIRST_TRY_POINTS else "lightgreen"
+            self.feedback.config(text=f"Correct! +{points} 🦇", fg=colour)
+            self.score_label.config(text=self.score_text())
 
-            if question_count == 10:
+            if self.quiz.finished():
                 self.results()
             else:
                 self.root.after(800, self.new_question)
 
-        else:
-            if attempt == 1:
-                attempt = 2
-                self.feedback.config(text="Wrong! Try again…", fg="red")
-            else:
-                self.feedback.config(
-                    text=f"Wrong! Correct = {correct_answer}",
-                    fg="red"
-                )
+        elif outcome == TRY_AGAIN:
+            self.feedback.config(text="Wrong! Try again…", fg="red")
 
-                if question_count == 10:
-                    self.root.after(1200, self.results)
-                else:
-                    self.root.after(1200, self.new_question)
+        elif outcome == WRONG:
+            self.feedback.config(
+                text=f"Wrong! Correct = {self.quiz.question().answer}",
+                fg="red"
+            )
 
-    # RESULTS SCREEN
-    def results(self):
-        self.clear()
-
-        percent = (score / 100) * 100
-
-        if percent >= 90:
-            grade = "A+"
-        elif percent >= 80:
-            grade = "A"
-        elif percent >= 70:
-            grade = "B"
-        elif percent >= 60:
-            grade = "C"
-        else:
-            grade = "F"
+            if self.quiz.finished():
+                self.root.after(1200, self.results)
+            else:
+                self.root.after(1200, self.new_question)
+
+    # ADAPTIVE RATING
+    # One O(1) Elo update per finished question, saved straight away so
+    # leaving mid-round keeps it.
+    def rate_answer(self, points, seconds):
+        rating = self.adaptive.rating
+        self.adaptive.answered(self.step, points, FIRST_TRY_POINTS, seconds)
+        self.log.save_rating(self.player, rating.value, rating.answered)
+        self.score_label.config(text=self.score_text())
+
+    def score_text(self):
+        if self.adaptive:
+            return f"Score: {self.quiz.score}   Rating: {self.adaptive.rating.value:.0f}"
+        return f"Score: {self.quiz.score}"
 
-        tk.Label(
+    # RESULTS SCREEN
+    def build_results(self):
+        self.add("results", tk.Label(
             self.root, text="RESULTS",
             font=("Arial", 44, "bold"), fg="yellow", bg="#000"
-        ).place(relx=0.5, rely=0.15, anchor="center")
+        ), relx=0.5, rely=0.15, anchor="center")
 
-        tk.Label(
-            self.root, text=f"Total Score: {score}/100",
+        self.total_label = self.add("results", tk.Label(
+            self.root, text="",
             font=("Arial", 30), fg="white", bg="#000"
-        ).place(relx=0.5, rely=0.30, anchor="center")
+        ), relx=0.5, rely=0.30, anchor="center")
 
-        tk.Label(
-            self.root, text=f"Percentage: {percent:.1f}%",
+        self.percent_label = self.add("results", tk.Label(
+            self.root, text="",
             font=("Arial", 30), fg="white", bg="#000"
-        ).place(relx=0.5, rely=0.40, anchor="center")
+        ), relx=0.5, rely=0.40, anchor="center")
 
-        tk.Label(
-            self.root, text=f"Rank: {grade}",
+        self.rank_label = self.add("results", tk.Label(
+            self.root, text="",
             font=("Arial", 30), fg="yellow", bg="#000"
-        ).place(relx=0.5, rely=0.50, anchor="center")
+        ), relx=0.5, rely=0.50, anchor="center")
 
         # SCORING RULES
-        tk.Label(
+        self.add("results", tk.Label(
             self.root,
             text="Scoring System:\n✔ 10 points — Correct on 1st try\n✔ 5 points — Correct on 2nd try\n✘ 0 points — Wrong both tries",
             font=("Arial", 22, "bold"),
             fg="lightblue",
             bg="#000",
             justify="center"
-        ).place(relx=0.5, rely=0.67, anchor="center")
+        ), relx=0.5, rely=0.67, anchor="center")
 
-        tk.Button(
+        self.add("results", tk.Button(
             self.root, text="Play Again",
             font=("Arial", 26), bg="yellow",
             command=self.main_menu
-        ).place(relx=0.5, rely=0.82, anchor="center")
+        ), relx=0.5, rely=0.82, anchor="center")
+
+        self.add("results", tk.Button(
+            self.root, text="My History",
+            font=("Arial", 22), bg="yellow",
+            command=self.history
+        ), relx=0.75, rely=0.82, anchor="center")
 
-        tk.Button(
+        self.add("results", tk.Button(
             self.root, text="Exit",
             font=("Arial", 22), bg="red", fg="white",
             command=self.root.quit
-        ).place(relx=0.5, rely=0.90, anchor="center")
+        ), relx=0.5, rely=0.90, anchor="center")
+
+    def results(self):
+        self.total_label.config(text=f"Total Score: {self.quiz.score}/{self.quiz.max_score()}")
+        self.percent_label.config(text=f"Percentage: {self.quiz.percent():.1f}%")
+        rank = f"Rank: {self.quiz.rank()}"
+        if self.adaptive:
+            rank += f"   Rating: {self.adaptive.rating.value:.0f}"
+        self.rank_label.config(text=rank)
+        self.log.save_round(self.player, self.level, self.quiz, self.started)
+        self.show("results")
+
+    # LEADERBOARD
+    def build_leaderboard(self):
+        self.leaderboard_title = self.add("leaderboard", tk.Label(
+            self.root, text="",
+            font=("Arial", 40, "bold"), fg="yellow", bg="#000"
+        ), relx=0.5, rely=0.12, anchor="center")
+
+        for n, level in enumerate(LEVELS):
+            self.add("leaderboard", tk.Button(
+                self.root, text=level, font=("Arial", 20), bg="yellow",
+                command=lambda level=level: self.leaderboard(level)
+            ), relx=0.275 + n * 0.15, rely=0.23, anchor="center")
+
+        self.leaderboard_text = self.add("leaderboard", tk.Label(
+            self.root, text="", font=("Courier", 20),
+            fg="white", bg="#000", justify="left"
+        ), relx=0.5, rely=0.55, anchor="center")
+
+        self.add("leaderboard", tk.Button(
+            self.root, text="Back", font=("Arial", 22),
+            bg="yellow", fg="black", command=self.main_menu
+        ), relx=0.5, rely=0.90, anchor="center")
+
+    def leaderboard(self, level):
+        lines = [f"{n:>2}. {player[:16]:<16} {score:>3}/{top}  {rank:<2}  {format_date(started)}"
+                 for n, (player, score, top, rank, started)
+                 in enumerate(self.log.leaderboard(level), 1)]
+
+        self.leaderboard_title.config(text=f"LEADERBOARD — {level.upper()}")
+        self.leaderboard_text.config(text="\n".join(lines) or "No rounds played yet")
+        self.show("leaderboard")
+
+    # PLAYER HISTORY
+    def build_history(self):
+        self.history_title = self.add("history", tk.Label(
+            self.root, text="",
+            font=("Arial", 40, "bold"), fg="yellow", bg="#000"
+        ), relx=0.5, rely=0.12, anchor="center")
+
+        self.history_text = self.add("history", tk.Label(
+            self.root, text="", font=("Courier", 20),
+            fg="white", bg="#000", justify="left"
+        ), relx=0.5, rely=0.50, anchor="center")
+
+        self.add("history", tk.Button(
+            self.root, text="Back", font=("Arial", 22),
+            bg="yellow", fg="black", command=self.main_menu
+        ), relx=0.5, rely=0.90, anchor="center")
+
+    def history(self):
+        lines = [f"{format_date(started)}  {level:<9} {score:>3}/{top}  {rank:<2}  {seconds:6.1f}s"
+                 for started, level, score, top, rank, seconds
+                 in self.log.history(self.player)]
+
+        self.history_title.config(text=f"HISTORY — {self.player.upper()}")
+        self.history_text.config(text="\n".join(lines) or "No rounds played yet")
+        self.show("history")
+
+    # TIMING OVERLAY
+    # Built after the screens so it stays on top of them.
+    def build_overlay(self):
+        self.overlay = tk.Label(
+            self.root, text="", font=("Courier", 12),
+            fg="lightgreen", bg="#000", justify="left"
+        )
+        self.root.bind("<F2>", lambda event: self.toggle_overlay())
+        self.root.bind("<F3>", lambda event: self.save_timings())
+
+    def toggle_overlay(self):
+        if self.overlay_job is None:
+            self.overlay.place(x=10, y=10)
+            self.refresh_overlay()
+        else:
+            self.root.after_cancel(self.overlay_job)
+            self.overlay_job = None
+            self.overlay.place_forget()
+
+    def refresh_overlay(self):
+        lines = [f"{kind:<26} n={count:<5} p50 {p50 * 1000:8.1f}ms  p95 {p95 * 1000:8.1f}ms"
+                 for kind, (count, p50, p95) in self.timings.summary().items()]
+        self.overlay.config(text="\n".join(lines) or "No timings yet")
+        self.overlay_job = self.root.after(OVERLAY_REFRESH, self.refresh_overlay)
+
+    def save_timings(self):
+        file_name = self.timings.dump()
+        messagebox.showinfo("Timings", f"Timings saved to {file_name}")
 
 
 # RUN APP
 root = tk.Tk()
-MathQuiz(root)
+app = MathQuiz(root)
 root.mainloop()
+app.log.close()
@@ -0,0 +1,182 @@
+# Question generation for the Math Quiz, kept apart from the window so
+# rounds can be made up front, repeated from a seed, or printed out as
+# handouts. For example:
+#
+#   python question_engine.py Easy --rounds 500 --seed 7 -o handouts.txt
+
+import argparse
+import bisect
+import operator
+import random
+import sys
+from collections import namedtuple
+
+ROUND_LENGTH = 10
+
+# Each difficulty lists the range of each operand and which operators
+# to use. Adding a level only needs a new entry here.
+PROFILES = {
+    "Easy": {"a": (1, 9), "b": (1, 9), "ops": "+-*"},
+    "Moderate": {"a": (10, 99), "b": (10, 99), "ops": "+-*"},
+    "Advanced": {"a": (100, 9999), "b": (1, 50), "ops": "+-*"},
+}
+
+OPERATIONS = {"+": operator.add, "-": operator.sub, "*": operator.mul}
+
+# Adaptive mode climbs these steps. Each has a rating on the same scale as
+# the players' ratings, and "seconds" is how long a quick answer takes.
+ADAPTIVE_STEPS = (
+    (500, {"a": (1, 5), "b": (1, 5), "ops": "+", "seconds": 5}),
+    (650, {"a": (1, 9), "b": (1, 9), "ops": "+-", "seconds": 6}),
+    (800, {"a": (1, 9), "b": (1, 9), "ops": "+-*", "seconds": 6}),
+    (950, {"a": (10, 99), "b": (1, 9), "ops": "+-", "seconds": 8}),
+    (1100, {"a": (10, 99), "b": (10, 99), "ops": "+-", "seconds": 10}),
+    (1250, {"a": (10, 99), "b": (2, 9), "ops": "+-*", "seconds": 12}),
+    (1400, {"a": (10, 99), "b": (10, 99), "ops": "+-*", "seconds": 20}),
+    (1550, {"a": (100, 999), "b": (10, 99), "ops": "+-*", "seconds": 25}),
+    (1700, {"a": (100, 9999), "b": (1, 50), "ops": "+-*", "seconds": 30}),
+    (1850, {"a": (100, 9999), "b": (10, 99), "ops": "+-*", "seconds": 40}),
+)
+
+START_RATING = 1000
+RATING_SCALE = 400      # 400 points apart means 10 to 1 odds, as in chess
+AIM_BELOW = 150         # pick steps a bit under the player, about 70% right
+NEW_PLAYER_K = 48       # big steps while the rating is still a guess
+SETTLED_K = 24
+SETTLED_AFTER = 30      # questions answered before the rating settles
+SLOW_FACTOR = 0.8       # a right but slow answer counts for a bit less
+
+
+class Question(namedtuple("Question", "a op b answer")):
+    __slots__ = ()
+
+    def text(self):
+        return f"{self.a} {self.op} {self.b} = ?"
+
+    # 3 + 4 and 4 + 3 count as the same question
+    def key(self):
+        if self.op in "+*" and self.b < self.a:
+            return (self.b, self.op, self.a)
+        return (self.a, self.op, self.b)
+
+
+# CODE FOR THE ENGINE
+
+class QuestionEngine:
+    def __init__(self, seed=None, profiles=PROFILES):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.profiles = profiles
+
+    def question(self, difficulty):
+        profile = self.profiles[difficulty]
+        randint = self.random.randint
+        a = randint(*profile["a"])
+        b = randint(*profile["b"])
+        op = self.random.choice(profile["ops"])
+        return Question(a, op, b, OPERATIONS[op](a, b))
+
+    # how many different questions a profile can make
+    def variety(self, difficulty):
+        profile = self.profiles[difficulty]
+        (a_low, a_high), (b_low, b_high) = profile["a"], profile["b"]
+        return (a_high - a_low + 1) * (b_high - b_low + 1) * len(profile["ops"])
+
+    def round(self, difficulty, length=ROUND_LENGTH):
+        # the variety counts 3 + 4 and 4 + 3 apart, so halve it to be safe
+        if length > self.variety(difficulty) // 2:
+            raise ValueError(f"{difficulty} cannot make {length} different questions")
+
+        questions = []
+        seen = set()
+        while len(questions) < length:
+            q = self.question(difficulty)
+            if q.key() not in seen:
+                seen.add(q.key())
+                questions.append(q)
+        return questions
+
+    def rounds(self, difficulty, count, length=ROUND_LENGTH):
+        return [self.round(difficulty, length) for _ in range(count)]
+
+# CODE FOR ADAPTIVE MODE
+
+# An Elo rating. Each answer moves it by k * (result - expected), so an
+# update only needs the current value and the question's step rating.
+class Rating:
+    def __init__(self, value=START_RATING, answered=0):
+        self.value = value
+        self.answered = answered
+
+    def expected(self, difficulty):
+        return 1 / (1 + 10 ** ((difficulty - self.value) / RATING_SCALE))
+
+    # result is 1 for a full answer, 0 for a wrong one, or in between
+    def update(self, difficulty, result):
+        k = NEW_PLAYER_K if self.answered < SETTLED_AFTER else SETTLED_K
+        change = k * (result - self.expected(difficulty))
+        self.value += change
+        self.answered += 1
+        return change
+
+
+class AdaptiveEngine:
+    def __init__(self, rating, seed=None, steps=ADAPTIVE_STEPS):
+        self.rating = rating
+        self.step_ratings = [step_rating for step_rating, profile in steps]
+        self.engine = QuestionEngine(seed, {n: profile for n, (step_rating, profile)
+                                            in enumerate(steps)})
+
+    def step(self):
+        n = bisect.bisect_right(self.step_ratings, self.rating.value - AIM_BELOW) - 1
+        return max(n, 0)
+
+    # a question from the player's step, and which step that is
+    def question(self, avoid=()):
+        step = self.step()
+        for tries in range(20):
+            q = self.engine.question(step)
+            if q.key() not in avoid:
+                break
+        return q, step
+
+    # points out of best, slowed down if it took longer than the step allows
+    def answered(self, step, points, best, seconds):
+        result = points / best
+        if result and seconds > self.engine.profiles[step]["seconds"]:
+            result *= SLOW_FACTOR
+        return self.rating.update(self.step_ratings[step], result)
+
+# CODE FOR HANDOUTS
+
+def write_handouts(rounds, out, answers=False):
+    for number, questions in enumerate(rounds, 1):
+        out.write(f"Round {number}\n")
+        for n, q in enumerate(questions, 1):
+            line = q.text()
+            if answers:
+                line += f" {q.answer}"
+            out.write(f"  {n:2}. {line}\n")
+        out.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print Math Quiz rounds.")
+    parser.add_argument("difficulty", choices=list(PROFILES))
+    parser.add_argument("-n", "--rounds", type=int, default=1)
+    parser.add_argument("-s", "--seed", type=int, default=None,
+                        help="the same seed always gives the same rounds")
+    parser.add_argument("-a", "--answers", action="store_true", help="include the answers")
+    parser.add_argument("-o", "--output", help="write here instead of the screen")
+    args = parser.parse_args(argv)
+
+    rounds = QuestionEngine(args.seed).rounds(args.difficulty, args.rounds)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write_handouts(rounds, out, args.answers)
+    else:
+        write_handouts(rounds, sys.stdout, args.answers)
+
+
+if __name__ == "__main__":
+    main()
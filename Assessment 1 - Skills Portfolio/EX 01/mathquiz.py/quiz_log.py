@@ -0,0 +1,115 @@
+# Every finished Math Quiz round is kept in a SQLite file: who played,
+# the difficulty, each question, every attempt with how long it took, and
+# the final score. Rounds are only ever added. The same file holds each
+# player's adaptive mode rating, one row per player.
+#
+# The leaderboard and the per-player history each read from their own
+# index and stop after `limit` rows. They cost the same with a hundred
+# rounds in the log or a million.
+
+import os
+import sqlite3
+import time
+
+# next to this file, wherever the quiz is started from
+LOG_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_log.db")
+
+LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL COLLATE NOCASE,
+    difficulty TEXT NOT NULL,
+    started REAL NOT NULL,
+    score INTEGER NOT NULL,
+    max_score INTEGER NOT NULL,
+    rank TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    round_id INTEGER NOT NULL REFERENCES rounds (id),
+    number INTEGER NOT NULL,
+    attempt INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    answer INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (round_id, number, attempt)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ratings (
+    player TEXT PRIMARY KEY COLLATE NOCASE,
+    rating REAL NOT NULL,
+    answered INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rounds_leaderboard ON rounds (difficulty, score DESC, started);
+CREATE INDEX IF NOT EXISTS rounds_by_player ON rounds (player, started DESC);
+"""
+
+
+class QuizLog:
+    def __init__(self, file_name=LOG_NAME):
+        self.db = sqlite3.connect(file_name)
+        # one transaction per round, no need to wait on the disk twice
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(LOG_SCHEMA)
+
+    # quiz is a finished quiz_scoring.QuizRound
+    def save_round(self, player, difficulty, quiz, started=None):
+        if started is None:
+            started = time.time()
+
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO rounds (player, difficulty, started, score, max_score, rank, seconds)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (player, difficulty, started, quiz.score, quiz.max_score(), quiz.rank(),
+                 quiz.seconds()))
+            round_id = cursor.lastrowid
+
+            rows = []
+            for number, attempt, answer, seconds in quiz.attempts:
+                q = quiz.questions[number - 1]
+                rows.append((round_id, number, attempt, f"{q.a} {q.op} {q.b}", q.answer,
+                             answer, seconds))
+            self.db.executemany(
+                "INSERT INTO attempts (round_id, number, attempt, question, correct, answer, seconds)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return round_id
+
+    # best rounds first, ties go to whoever got there first
+    def leaderboard(self, difficulty, limit=10):
+        return self.db.execute(
+            "SELECT player, score, max_score, rank, started FROM rounds"
+            " WHERE difficulty = ? ORDER BY score DESC, started LIMIT ?",
+            (difficulty, limit)).fetchall()
+
+    # newest rounds first
+    def history(self, player, limit=15):
+        return self.db.execute(
+            "SELECT started, difficulty, score, max_score, rank, seconds FROM rounds"
+            " WHERE player = ? ORDER BY started DESC LIMIT ?",
+            (player, limit)).fetchall()
+
+    def attempts(self, round_id):
+        return self.db.execute(
+            "SELECT number, attempt, question, correct, answer, seconds FROM attempts"
+            " WHERE round_id = ? ORDER BY number, attempt", (round_id,)).fetchall()
+
+    # (rating, questions answered), or None for a new player
+    def load_rating(self, player):
+        return self.db.execute("SELECT rating, answered FROM ratings WHERE player = ?",
+                               (player,)).fetchone()
+
+    def save_rating(self, player, rating, answered):
+        with self.db:
+            self.db.execute(
+                "INSERT INTO ratings (player, rating, answered) VALUES (?, ?, ?)"
+                " ON CONFLICT (player) DO UPDATE SET rating = excluded.rating,"
+                " answered = excluded.answered", (player, rating, answered))
+
+    def close(self):
+        self.db.close()
+
+
+def format_date(started):
+    return time.strftime("%d %b %Y %H:%M", time.localtime(started))
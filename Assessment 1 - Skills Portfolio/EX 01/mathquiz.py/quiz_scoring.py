@@ -0,0 +1,106 @@
+# The Math Quiz scoring rules, with no window attached, so they can be
+# tested and simulated on their own.
+#
+# A QuizRound moves between three states:
+#   ASKING    waiting for an answer to the current question
+#   ANSWERED  the question is over, waiting for next_question()
+#   FINISHED  the last question is over
+# Answers given outside ASKING are ignored, so a second click on Submit
+# while the feedback shows cannot score twice.
+
+FIRST_TRY_POINTS = 10
+SECOND_TRY_POINTS = 5
+
+ASKING = "asking"
+ANSWERED = "answered"
+FINISHED = "finished"
+
+# what answer() says happened
+CORRECT = "correct"
+TRY_AGAIN = "try again"
+WRONG = "wrong"
+IGNORED = "ignored"
+
+# lowest percentage for each rank, best first
+RANKS = ((90, "A+"), (80, "A"), (70, "B"), (60, "C"), (0, "F"))
+
+
+def rank(percent):
+    for lowest, name in RANKS:
+        if percent >= lowest:
+            return name
+    return RANKS[-1][1]
+
+
+class QuizRound:
+    def __init__(self, questions):
+        self.questions = questions
+        self.index = 0
+        self.attempt = 1
+        self.score = 0
+        self.attempts = []      # (question number, attempt, answer, seconds)
+        self.state = ASKING if questions else FINISHED
+
+    def question(self):
+        return self.questions[self.index]
+
+    def number(self):
+        return self.index + 1
+
+    # adaptive mode picks each question just before it is shown
+    def set_question(self, question):
+        self.questions[self.index] = question
+
+    # returns (what happened, points scored). seconds is how long the
+    # player took, it is only kept for the record.
+    def answer(self, value, seconds=0.0):
+        if self.state != ASKING:
+            return IGNORED, 0
+        self.attempts.append((self.number(), self.attempt, value, seconds))
+
+        if value == self.question().answer:
+            points = FIRST_TRY_POINTS if self.attempt == 1 else SECOND_TRY_POINTS
+            self.score += points
+            self.end_question()
+            return CORRECT, points
+
+        if self.attempt == 1:
+            self.attempt = 2
+            return TRY_AGAIN, 0
+
+        self.end_question()
+        return WRONG, 0
+
+    def end_question(self):
+        if self.index + 1 == len(self.questions):
+            self.state = FINISHED
+        else:
+            self.state = ANSWERED
+
+    def next_question(self):
+        if self.state == ANSWERED:
+            self.index += 1
+            self.attempt = 1
+            self.state = ASKING
+
+    def finished(self):
+        return self.state == FINISHED
+
+    def max_score(self):
+        return FIRST_TRY_POINTS * len(self.questions)
+
+    def percent(self):
+        if not self.questions:
+            return 0.0
+        return self.score / self.max_score() * 100
+
+    def rank(self):
+        return rank(self.percent())
+
+    # attempt times run from when the question appeared, so a question
+    # took as long as its last attempt
+    def seconds(self):
+        last = {}
+        for number, attempt, value, seconds in self.attempts:
+            last[number] = seconds
+        return sum(last.values())
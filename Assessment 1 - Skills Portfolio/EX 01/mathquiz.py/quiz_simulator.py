@@ -0,0 +1,160 @@
+# Plays simulated Math Quiz rounds without a window, to see how scores
+# and ranks spread for a given answer accuracy. For example:
+#
+#   python quiz_simulator.py --rounds 1000000 --accuracy 0.8
+#   python quiz_simulator.py -d Advanced -r 200000 -a 0.5 0.7 0.9 --format json
+#
+# A simulated player gets each attempt right with the given chance. The
+# rounds are split into batches with their own seeds and spread over a
+# pool of worker processes. The same --seed gives the same numbers
+# whatever the number of workers. Each report also shows the mean score
+# the rules should give for that accuracy, so a scoring change that moves
+# the mean stands out.
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from question_engine import PROFILES, ROUND_LENGTH, QuestionEngine
+from quiz_scoring import FIRST_TRY_POINTS, RANKS, SECOND_TRY_POINTS, QuizRound
+
+BATCH = 20000   # rounds per job sent to a worker
+
+# CODE FOR THE SIMULATION
+
+class SimStats:
+    def __init__(self):
+        self.rounds = 0
+        self.scores = Counter()
+        self.ranks = Counter()
+
+    def add(self, quiz):
+        self.rounds += 1
+        self.scores[quiz.score] += 1
+        self.ranks[quiz.rank()] += 1
+
+    def merge(self, other):
+        self.rounds += other.rounds
+        self.scores.update(other.scores)
+        self.ranks.update(other.ranks)
+
+    def mean(self):
+        if not self.rounds:
+            return 0.0
+        return sum(score * n for score, n in self.scores.items()) / self.rounds
+
+
+def expected_score(accuracy, length=ROUND_LENGTH):
+    p = accuracy
+    return length * (FIRST_TRY_POINTS * p + SECOND_TRY_POINTS * (1 - p) * p)
+
+
+def play_rounds(difficulty, accuracy, count, seed):
+    engine = QuestionEngine(seed)
+    player = random.Random(f"player {seed}")
+    stats = SimStats()
+
+    for _ in range(count):
+        quiz = QuizRound(engine.round(difficulty))
+        while not quiz.finished():
+            answer = quiz.question().answer
+            if player.random() >= accuracy:
+                answer += 1
+            quiz.answer(answer)
+            quiz.next_question()
+        stats.add(quiz)
+    return stats
+
+
+def simulate(difficulty, accuracy, rounds, seed=0, workers=None):
+    sizes = [BATCH] * (rounds // BATCH)
+    if rounds % BATCH:
+        sizes.append(rounds % BATCH)
+    seeds = [seed * 1000003 + n for n in range(len(sizes))]
+
+    stats = SimStats()
+    if workers == 1 or len(sizes) < 2:
+        results = map(play_rounds, [difficulty] * len(sizes), [accuracy] * len(sizes),
+                      sizes, seeds)
+        for part in results:
+            stats.merge(part)
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(play_rounds, [difficulty] * len(sizes),
+                             [accuracy] * len(sizes), sizes, seeds):
+            stats.merge(part)
+    return stats
+
+# CODE FOR OUTPUT
+
+def summary(difficulty, accuracy, stats, seconds):
+    return {
+        "difficulty": difficulty,
+        "accuracy": accuracy,
+        "rounds": stats.rounds,
+        "seconds": round(seconds, 3),
+        "rounds_per_second": round(stats.rounds / seconds) if seconds else 0,
+        "mean_score": round(stats.mean(), 3),
+        "expected_score": round(expected_score(accuracy), 3),
+        "ranks": {name: stats.ranks[name] for lowest, name in RANKS},
+        "scores": {str(score): n for score, n in sorted(stats.scores.items())}
+    }
+
+
+def write_text(rows, out):
+    for row in rows:
+        rounds = row["rounds"] or 1
+        out.write(f"{row['difficulty']} at {row['accuracy']:.0%} accuracy: "
+                  f"{row['rounds']} rounds in {row['seconds']:.2f}s "
+                  f"({row['rounds_per_second']} rounds/s)\n")
+        out.write(f"  mean score {row['mean_score']:.2f}  "
+                  f"(rules say {row['expected_score']:.2f})\n")
+        out.write("  ranks   " + "  ".join(f"{name} {n / rounds:.1%}"
+                                           for name, n in row["ranks"].items()) + "\n")
+        out.write("  scores\n")
+        for score, n in row["scores"].items():
+            out.write(f"    {score:>4} {n / rounds:6.2%} {'#' * round(n / rounds * 50)}\n")
+        out.write("\n")
+
+
+def write_json(rows, out):
+    json.dump(rows, out, indent=2)
+    out.write("\n")
+
+
+WRITERS = {"text": write_text, "json": write_json}
+
+# CODE FOR THE COMMAND LINE
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate Math Quiz rounds.")
+    parser.add_argument("-d", "--difficulty", choices=list(PROFILES), default="Easy")
+    parser.add_argument("-r", "--rounds", type=int, default=100000)
+    parser.add_argument("-a", "--accuracy", type=float, nargs="+", default=[0.8],
+                        help="chance of getting an attempt right, 0 to 1")
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default="text")
+    args = parser.parse_args(argv)
+
+    for accuracy in args.accuracy:
+        if not 0 <= accuracy <= 1:
+            parser.error(f"accuracy must be between 0 and 1, not {accuracy}")
+
+    rows = []
+    for accuracy in args.accuracy:
+        start = time.perf_counter()
+        stats = simulate(args.difficulty, accuracy, args.rounds, args.seed, args.workers)
+        rows.append(summary(args.difficulty, accuracy, stats, time.perf_counter() - start))
+
+    WRITERS[args.format](rows, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
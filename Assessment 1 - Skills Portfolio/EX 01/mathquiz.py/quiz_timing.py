@@ -0,0 +1,69 @@
+# Timing samples for the Math Quiz: how long players take per question
+# type and how long the window takes over its own work. Samples go into
+# a ring buffer, so only the newest `size` are kept and memory stays flat
+# however long the quiz runs. time.perf_counter is used because it is
+# monotonic and finer than time.monotonic on Windows.
+
+import json
+import math
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+TIMINGS_SIZE = 5000
+TIMINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_timings.json")
+
+
+def percentile(ordered, p):
+    # nearest rank on an already sorted list
+    if not ordered:
+        return 0.0
+    index = max(0, math.ceil(p * len(ordered) / 100) - 1)
+    return ordered[index]
+
+
+class Timings:
+    def __init__(self, size=TIMINGS_SIZE):
+        self.samples = deque(maxlen=size)     # (kind, seconds, when)
+        self.start = time.perf_counter()
+
+    def now(self):
+        return time.perf_counter()
+
+    def record(self, kind, seconds):
+        self.samples.append((kind, seconds, time.perf_counter() - self.start))
+
+    @contextmanager
+    def measure(self, kind):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, time.perf_counter() - start)
+
+    # {kind: (count, p50, p95)} in seconds
+    def summary(self):
+        by_kind = {}
+        for kind, seconds, when in self.samples:
+            by_kind.setdefault(kind, []).append(seconds)
+
+        result = {}
+        for kind in sorted(by_kind):
+            ordered = sorted(by_kind[kind])
+            result[kind] = (len(ordered), percentile(ordered, 50), percentile(ordered, 95))
+        return result
+
+    def as_dict(self):
+        return {
+            "summary": {kind: {"count": count, "p50": p50, "p95": p95}
+                        for kind, (count, p50, p95) in self.summary().items()},
+            "samples": [{"kind": kind, "seconds": seconds, "at": when}
+                        for kind, seconds, when in self.samples]
+        }
+
+    def dump(self, file_name=TIMINGS_FILE):
+        with open(file_name, "w", encoding="utf-8") as out:
+            json.dump(self.as_dict(), out, indent=2)
+            out.write("\n")
+        return file_name
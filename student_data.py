@@ -0,0 +1,1116 @@
+# Data layer for the student manager: reading and writing studentMarks.txt,
+# the mark calculations and the student stores. Nothing here needs Tk, so
+# it can be used from the command line (see student_report.py) as well as
+# from the window in studentsmanagment.py.
+
+import math
+import os
+import sqlite3
+from array import array
+from bisect import bisect_left, bisect_right
+
+FILE_NAME = "studentMarks.txt"
+DB_NAME = "studentMarks.db"
+STORAGE = "text"    # "text" for FILE_NAME, "sqlite" for DB_NAME
+FLUSH_DELAY = 500   # ms to wait after the last edit before writing the file
+COLUMNAR = False    # keep marks in compact array columns instead of dicts
+CHUNK_SIZE = 1000   # rows parsed (and shown) per step while loading
+JOURNAL = False     # log each edit to a journal and compact it into the file
+COMPACT_DELAY = 30000   # ms of quiet before the journal is compacted
+COMPACT_EVERY = 1000    # journal entries that force a compaction
+
+# CODE FOR FILE HANDLING
+
+# Why a row was rejected, with its line number (line 1 is the header).
+class LoadReport:
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.missing = False
+        self.declared = None
+        self.loaded = 0
+        self.errors = []
+        self.replayed = 0
+        self.journal_skipped = 0
+
+    def add_error(self, line_no, text, reason):
+        self.errors.append((line_no, text, reason))
+
+    def count_mismatch(self):
+        return self.declared is not None and self.declared != self.loaded + len(self.errors)
+
+    def has_problems(self):
+        return (self.missing or bool(self.errors) or self.count_mismatch()
+                or self.journal_skipped > 0)
+
+    def headline(self):
+        return f"Loaded {self.loaded} students from {self.file_name}."
+
+    def summary(self, limit=10):
+        if self.missing:
+            return f"{self.file_name} file not found"
+
+        lines = [self.headline()]
+        if self.count_mismatch():
+            lines.append(f"The first line says {self.declared} students but "
+                         f"{self.loaded + len(self.errors)} rows were found.")
+        if self.errors:
+            lines.append(f"Skipped {len(self.errors)} bad rows:")
+            for line_no, text, reason in sorted(self.errors)[:limit]:
+                lines.append(f"  line {line_no}: {reason}  ({text})")
+            if len(self.errors) > limit:
+                lines.append(f"  ... and {len(self.errors) - limit} more")
+        if self.replayed:
+            lines.append(f"Replayed {self.replayed} unsaved edits from the journal.")
+        if self.journal_skipped:
+            lines.append(f"Ignored {self.journal_skipped} unreadable journal entries.")
+        return "\n".join(lines)
+
+
+# What a bulk import did with each good row, on top of the bad-row report.
+class ImportReport(LoadReport):
+    def __init__(self, source):
+        super().__init__(source)
+        self.added = 0
+        self.updated = 0
+        self.skipped = 0
+
+    def headline(self):
+        return (f"Imported {self.loaded} students from {self.file_name}: "
+                f"{self.added} added, {self.updated} updated, "
+                f"{self.skipped} skipped because the code already exists.")
+
+
+def mark(value, field, top):
+    try:
+        number = int(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"{field} is not a number")
+    if not 0 <= number <= top:
+        raise ValueError(f"{field} must be between 0 and {top}")
+    return number
+
+
+# turn one line into a student dict, raising ValueError with the reason
+def parse_student(line):
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) != 6:
+        raise ValueError(f"expected 6 fields, found {len(parts)}")
+
+    code = parts[0]
+    if not code.isdigit() or not 1000 <= int(code) <= 9999:
+        raise ValueError("code must be a number between 1000 and 9999")
+    if not parts[1]:
+        raise ValueError("name is empty")
+
+    return {
+        "code": code,
+        "name": parts[1],
+        "c1": mark(parts[2], "coursework 1", 20),
+        "c2": mark(parts[3], "coursework 2", 20),
+        "c3": mark(parts[4], "coursework 3", 20),
+        "exam": mark(parts[5], "exam", 100)
+    }
+
+
+# the number for a code string as the file writes it ("1234", not "01234"),
+# or None if it cannot be a student code
+def code_number(code):
+    if code.isascii() and code.isdigit() and len(code) == 4 and code[0] != "0":
+        return int(code)
+    return None
+
+
+# Streams the file and yields lists of (line number, student) pairs, at most
+# chunk_size long, so only one chunk is held in memory at a time. Bad rows go
+# into the report instead of stopping the load.
+def iter_student_chunks(file_name, report, chunk_size=CHUNK_SIZE):
+    if not os.path.exists(file_name):
+        report.missing = True
+        return
+
+    with open(file_name, "r") as file:
+        yield from iter_line_chunks(file, report, chunk_size)
+
+
+# The same for any lines of text, e.g. rows pasted into the window. With
+# header_required=False the count line may be left out.
+def iter_line_chunks(lines, report, chunk_size=CHUNK_SIZE, header_required=True):
+    chunk = []
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+
+        if line_no == 1:
+            try:
+                report.declared = int(line)
+                continue
+            except ValueError:
+                if header_required:
+                    report.add_error(1, line, "first line should be the number of students")
+                    continue
+
+        if not line:
+            continue
+
+        try:
+            chunk.append((line_no, parse_student(line)))
+        except ValueError as e:
+            report.add_error(line_no, line, str(e))
+            continue
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+# the whole file as a list; pass a LoadReport to find out what was skipped
+def load_students(file_name=FILE_NAME, report=None):
+    if report is None:
+        report = LoadReport(file_name)
+    students = [s for chunk in iter_student_chunks(file_name, report) for _, s in chunk]
+    report.loaded = len(students)
+    return students
+
+
+def format_student(s):
+    return f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}"
+
+
+# Writes to a temp file first and renames it over the real one, so a crash
+# part way through never leaves a truncated class list behind.
+def save_students(students, file_name=FILE_NAME):
+    temp_name = file_name + ".tmp"
+    with open(temp_name, "w") as file:
+        file.write(str(len(students)) + "\n")
+        for s in students:
+            file.write(format_student(s) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_name, file_name)
+
+
+def file_signature(file_name):
+    try:
+        info = os.stat(file_name)
+    except OSError:
+        return None
+    return (info.st_mtime_ns, info.st_size)
+
+# CODE FOR THE IN-MEMORY STUDENT STORE
+
+# The store reads the marks file once and answers every button from memory.
+# Edits are written back after FLUSH_DELAY ms of quiet (write-behind), so a
+# burst of edits costs one file write. The file is only re-read when its
+# mtime/size changes, which picks up edits made outside the app.
+#
+# Loading streams the file in chunks (see load_in_chunks) and keeps a
+# LoadReport of skipped rows; on_load, if set, is called with it afterwards.
+#
+# In journal mode each edit is appended to <file>.journal and fsynced, which
+# costs O(1) I/O. The marks file itself is only rewritten when the journal
+# is compacted (after COMPACT_DELAY ms of quiet, COMPACT_EVERY entries, or
+# on close). Loading reads the file and then replays the journal on top.
+#
+# Students are kept in two hash indexes: by_code (code -> student, in file
+# order) and by_name (case-folded name -> list of students). Names are not
+# unique, so a name lookup can return several students.
+class StudentStore:
+    def __init__(self, file_name=FILE_NAME, scheduler=None, flush_delay=FLUSH_DELAY,
+                 journal=JOURNAL):
+        self.file_name = file_name
+        self.scheduler = scheduler      # any Tk widget, used for after()
+        self.flush_delay = flush_delay
+        self.journal = journal
+        self.journal_name = file_name + ".journal"
+        self.journal_file = None
+        self.journal_entries = 0
+        self.by_code = {}
+        self.by_name = {}
+        self.signature = None
+        self.loaded = False
+        self.dirty = False
+        self.flush_job = None
+        self.loading = False
+        self.loader = None
+        self.report = None
+        self.on_load = None
+
+    def needs_reload(self):
+        # unsaved edits in memory win over the copy on disk
+        if self.dirty or self.loading:
+            return False
+        return not self.loaded or file_signature(self.file_name) != self.signature
+
+    def refresh(self):
+        if self.needs_reload():
+            for _ in self.load_in_chunks():
+                pass
+
+    # Returns a generator that reloads the file one chunk at a time and
+    # yields the students added by each chunk, so a caller can show them
+    # straight away. It is kept so close() can finish a load left half way.
+    def load_in_chunks(self):
+        self.loader = self.read_chunks()
+        return self.loader
+
+    def read_chunks(self):
+        signature = file_signature(self.file_name)
+        report = LoadReport(self.file_name)
+        self.loading = True
+        self.reset()
+
+        try:
+            for chunk in iter_student_chunks(self.file_name, report):
+                added = []
+                for line_no, s in chunk:
+                    # a repeated code keeps the first row, as the old scan did
+                    if self.has(s["code"]):
+                        report.add_error(line_no, s["code"], "duplicate code, first row kept")
+                        continue
+                    self.index(s)
+                    # the stored record has total, percent and grade; in the
+                    # columnar store it is a fresh row, not s itself
+                    added.append(self.record(s["code"]))
+
+                report.loaded += len(added)
+                yield added
+
+            if self.journal:
+                self.replay_journal(report)
+        finally:
+            self.loading = False
+
+        self.signature = signature
+        self.loaded = True
+        self.report = report
+        if self.on_load is not None:
+            self.on_load(report)
+
+        # edits made while the file was loading were held back by flush
+        if self.dirty and not self.journal:
+            self.schedule_flush(self.flush_delay)
+
+        # the file is behind the journal until the next compaction
+        if self.journal_entries:
+            self.dirty = True
+            self.schedule_flush(COMPACT_DELAY)
+
+    def replay_journal(self, report):
+        self.journal_entries = 0
+        if not os.path.exists(self.journal_name):
+            return
+
+        torn_at = None
+        with open(self.journal_name, "rb") as file:
+            offset = 0
+            for raw in file:
+                # a last line without its newline was cut short by a crash;
+                # even if it still parses, a mark may have lost digits
+                if not raw.endswith(b"\n"):
+                    torn_at = offset
+                    report.journal_skipped += 1
+                    break
+                offset += len(raw)
+                self.journal_entries += 1
+                try:
+                    self.apply_entry(raw.decode().rstrip("\r\n").split(","))
+                    report.replayed += 1
+                except ValueError:
+                    report.journal_skipped += 1
+
+        # cut the torn line off, so new entries are not glued onto it
+        if torn_at is not None:
+            with open(self.journal_name, "r+b") as file:
+                file.truncate(torn_at)
+
+    # Entries are "add,<row>", "update,<code>,<c1>,<c2>,<c3>,<exam>" and
+    # "delete,<code>". Replaying one twice gives the same result, so a crash
+    # between compaction and clearing the journal is harmless. A malformed
+    # entry raises ValueError and changes nothing.
+    def apply_entry(self, parts):
+        action, code = parts[0], parts[1] if len(parts) > 1 else ""
+        if action == "add":
+            student = parse_student(",".join(parts[1:]))
+            if self.has(code):
+                self.remove(code)
+            self.index(student)
+        elif action == "update":
+            if len(parts) != 6:
+                raise ValueError(f"update needs 6 fields, found {len(parts)}")
+            marks = (mark(parts[2], "coursework 1", 20), mark(parts[3], "coursework 2", 20),
+                     mark(parts[4], "coursework 3", 20), mark(parts[5], "exam", 100))
+            if self.has(code):
+                self.set_marks(code, *marks)
+        elif action == "delete":
+            if len(parts) != 2:
+                raise ValueError(f"delete needs 2 fields, found {len(parts)}")
+            if self.has(code):
+                self.remove(code)
+        else:
+            raise ValueError(f"unknown journal entry {action}")
+
+    def reset(self):
+        self.by_code = {}
+        self.by_name = {}
+        self.ranking = array("i")
+
+    def index(self, student):
+        add_derived(student)
+        self.by_code[student["code"]] = student
+        self.by_name.setdefault(student["name"].casefold(), []).append(student)
+        self.rank_add(student["code"], student["total"])
+
+    def remove(self, code):
+        student = self.by_code.pop(code)
+        self.rank_remove(code, student["total"])
+
+        key = student["name"].casefold()
+        same_name = self.by_name[key]
+        same_name.remove(student)
+        if not same_name:
+            del self.by_name[key]
+        return student
+
+    def set_marks(self, code, c1, c2, c3, exam):
+        student = self.by_code[code]
+        self.rank_remove(code, student["total"])
+        student.update(c1=c1, c2=c2, c3=c3, exam=exam)
+        add_derived(student)
+        self.rank_add(code, student["total"])
+
+    # The ranking is a sorted array of total * RANK_SCALE + code, one int
+    # per student. Codes are unique and below RANK_SCALE, so every key is
+    # unique and sorts by total first. Queries are binary searches. An
+    # insert or delete is O(N), since it shifts the rest of the array, but
+    # codes 1000-9999 cap N at 9000 ints (36 KB). Even the worst case, one
+    # memmove of the whole array, takes about 4 us per remove and add, which
+    # is quicker than a Fenwick tree over the same keys in pure Python.
+    def rank_add(self, code, total):
+        key = total * RANK_SCALE + int(code)
+        self.ranking.insert(bisect_left(self.ranking, key), key)
+
+    def rank_remove(self, code, total):
+        del self.ranking[bisect_left(self.ranking, total * RANK_SCALE + int(code))]
+
+    def ranked(self, keys):
+        return [self.record(str(key % RANK_SCALE)) for key in keys]
+
+    def has(self, code):
+        return code in self.by_code
+
+    # the stored record, without checking the file for changes
+    def record(self, code):
+        return self.by_code[code]
+
+    # records for a list of codes, in the same order
+    def records(self, codes):
+        return [self.record(code) for code in codes]
+
+    def all(self):
+        self.refresh()
+        return self.all_rows()
+
+    def all_rows(self):
+        return self.by_code.values()
+
+    def get(self, code):
+        self.refresh()
+        return self.by_code.get(code)
+
+    # every student matching a code or name; a code match is always unique
+    def find(self, key):
+        self.refresh()
+        key = key.strip()
+
+        student = self.by_code.get(key)
+        if student:
+            return [student]
+        return list(self.by_name.get(key.casefold(), []))
+
+    def add(self, student):
+        self.refresh()
+        if self.has(student["code"]):
+            return False
+
+        self.index(student)
+        self.changed("add," + format_student(student))
+        return True
+
+    def delete(self, code):
+        self.refresh()
+        if not self.has(code):
+            return None
+
+        student = self.remove(code)
+        self.changed(f"delete,{code}")
+        return student
+
+    def update_marks(self, student, c1, c2, c3, exam):
+        code = student["code"]
+        self.set_marks(code, c1, c2, c3, exam)
+        stored = self.record(code)
+        if stored is not student:
+            student.update(stored)
+        self.changed(f"update,{code},{c1},{c2},{c3},{exam}")
+
+    # Merges (line number, student) chunks into the roster in one pass. A
+    # code that is already there is overwritten when upsert is True and
+    # left alone otherwise. Everything is saved with a single write at the
+    # end; in journal mode that write is a compaction.
+    def bulk_import(self, chunks, report, upsert=True):
+        self.refresh()
+        for chunk in chunks:
+            for line_no, s in chunk:
+                report.loaded += 1
+                code = s["code"]
+                if not self.has(code):
+                    self.index(s)
+                    report.added += 1
+                elif upsert:
+                    self.replace(s)
+                    report.updated += 1
+                else:
+                    report.skipped += 1
+
+        if report.added or report.updated:
+            self.dirty = True
+            self.flush()
+        return report
+
+    def replace(self, s):
+        code = s["code"]
+        if self.record(code)["name"] == s["name"]:
+            self.set_marks(code, s["c1"], s["c2"], s["c3"], s["exam"])
+        else:
+            self.remove(code)
+            self.index(s)
+
+    def highest(self):
+        self.refresh()
+        return self.ranked(self.ranking[-1:])[0] if self.ranking else None
+
+    def lowest(self):
+        self.refresh()
+        return self.ranked(self.ranking[:1])[0] if self.ranking else None
+
+    def top(self, k):
+        self.refresh()
+        return self.ranked(reversed(self.ranking[-k:])) if k > 0 else []
+
+    def bottom(self, k):
+        self.refresh()
+        return self.ranked(self.ranking[:k]) if k > 0 else []
+
+    # percentage of the class with a strictly lower total
+    def percentile_rank(self, code):
+        self.refresh()
+        below = bisect_left(self.ranking, self.record(code)["total"] * RANK_SCALE)
+        return below / len(self.ranking) * 100
+
+    # students whose percentage lies between low and high (inclusive),
+    # lowest first
+    def between(self, low, high):
+        self.refresh()
+        low_total = math.ceil(low * MAX_TOTAL / 100 - 1e-9)
+        high_total = math.floor(high * MAX_TOTAL / 100 + 1e-9)
+        start = bisect_left(self.ranking, low_total * RANK_SCALE)
+        end = bisect_left(self.ranking, (high_total + 1) * RANK_SCALE)
+        return self.ranked(self.ranking[start:end])
+
+    def sorted_by_percentage(self, descending=False):
+        self.refresh()
+        keys = reversed(self.ranking) if descending else self.ranking
+        return map(self.record, (str(key % RANK_SCALE) for key in keys))
+
+    def changed(self, entry):
+        self.dirty = True
+
+        if not self.journal:
+            self.schedule_flush(self.flush_delay)
+            return
+
+        self.append_journal(entry)
+        if self.journal_entries >= COMPACT_EVERY:
+            self.flush()
+        else:
+            self.schedule_flush(COMPACT_DELAY)
+
+    def append_journal(self, entry):
+        if self.journal_file is None:
+            self.journal_file = open(self.journal_name, "a")
+        self.journal_file.write(entry + "\n")
+        self.journal_file.flush()
+        os.fsync(self.journal_file.fileno())
+        self.journal_entries += 1
+
+    def schedule_flush(self, delay):
+        if self.scheduler is None:
+            # without a scheduler, journal mode compacts on size or close
+            if not self.journal:
+                self.flush()
+            return
+
+        # restart the timer so a burst of edits is saved once
+        if self.flush_job is not None:
+            self.scheduler.after_cancel(self.flush_job)
+        self.flush_job = self.scheduler.after(delay, self.flush)
+
+    # writes the whole roster; in journal mode this is the compaction step
+    def flush(self):
+        if self.flush_job is not None and self.scheduler is not None:
+            self.scheduler.after_cancel(self.flush_job)
+        self.flush_job = None
+        if not self.dirty:
+            return
+        # only part of the roster is in memory yet; saving now would cut
+        # the file short, so the load saves once it has every row
+        if self.loading:
+            return
+
+        save_students(self.all_rows(), self.file_name)
+        self.signature = file_signature(self.file_name)
+        self.dirty = False
+
+        if self.journal:
+            # only cleared once the new file is safely in place
+            if self.journal_file is not None:
+                self.journal_file.close()
+                self.journal_file = None
+            open(self.journal_name, "w").close()
+            self.journal_entries = 0
+
+    def close(self):
+        # finish a load that is still running, so the save has every row
+        if self.loading and self.loader is not None:
+            for _ in self.loader:
+                pass
+        self.flush()
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+
+# CODE FOR MARK CALCULATIONS
+
+MAX_TOTAL = 160     # 3 courseworks out of 20 + exam out of 100
+RANK_SCALE = 10000  # codes are below this, see StudentStore.rank_add
+
+def total_mark(s):
+    return s["c1"] + s["c2"] + s["c3"] + s["exam"]
+
+def percentage(s):
+    return (total_mark(s) / MAX_TOTAL) * 100
+
+def grade(p):
+    if p >= 70: return "A"
+    elif p >= 60: return "B"
+    elif p >= 50: return "C"
+    elif p >= 40: return "D"
+    else: return "F"
+
+# grade for every possible total, so a whole column is graded by lookup
+GRADE_BY_TOTAL = [grade(t / MAX_TOTAL * 100) for t in range(MAX_TOTAL + 1)]
+
+def grade_for_total(total):
+    return GRADE_BY_TOTAL[min(max(total, 0), MAX_TOTAL)]
+
+# Stores total/percent/grade on the record itself. The store calls this when
+# a record is added or its marks change, so sorting and display never redo
+# the sums.
+def add_derived(s):
+    total = total_mark(s)
+    s["total"] = total
+    s["percent"] = total / MAX_TOTAL * 100
+    s["grade"] = grade_for_total(total)
+
+# CODE FOR THE COLUMNAR STUDENT STORE
+
+NAME_HASH_BITS = 32     # of each name's hash kept in the name index
+
+# One array per field instead of one dict per student: a row costs 24 bytes
+# of marks plus a pointer to its name, against roughly 300 bytes for a
+# dict. The total column is kept up to date as rows are added or changed,
+# and row() builds the old dict shape on demand with the percentage and
+# grade worked out from it.
+class StudentColumns:
+    FIELDS = ("code", "c1", "c2", "c3", "exam", "total")
+
+    def __init__(self):
+        self.code = array("i")
+        self.c1 = array("i")
+        self.c2 = array("i")
+        self.c3 = array("i")
+        self.exam = array("i")
+        self.total = array("i")
+        self.name = []
+
+    def __len__(self):
+        return len(self.code)
+
+    def __iter__(self):
+        return map(self.row, range(len(self.code)))
+
+    def append(self, s):
+        self.code.append(int(s["code"]))
+        self.name.append(s["name"])
+        self.c1.append(s["c1"])
+        self.c2.append(s["c2"])
+        self.c3.append(s["c3"])
+        self.exam.append(s["exam"])
+        self.total.append(s["c1"] + s["c2"] + s["c3"] + s["exam"])
+        return len(self.code) - 1
+
+    def row(self, i):
+        total = self.total[i]
+        return {
+            "code": str(self.code[i]),
+            "name": self.name[i],
+            "c1": self.c1[i],
+            "c2": self.c2[i],
+            "c3": self.c3[i],
+            "exam": self.exam[i],
+            "total": total,
+            "percent": total / MAX_TOTAL * 100,
+            "grade": grade_for_total(total)
+        }
+
+    def set_marks(self, i, c1, c2, c3, exam):
+        self.c1[i] = c1
+        self.c2[i] = c2
+        self.c3[i] = c3
+        self.exam[i] = exam
+        self.total[i] = c1 + c2 + c3 + exam
+
+    # delete by moving the last row into the hole; returns the code (an int)
+    # of the row that moved, or None when the last row itself was removed
+    def remove(self, i):
+        last = len(self.code) - 1
+        moved = None
+        if i != last:
+            for field in self.FIELDS:
+                column = getattr(self, field)
+                column[i] = column[last]
+            self.name[i] = self.name[last]
+            moved = self.code[i]
+
+        for field in self.FIELDS:
+            getattr(self, field).pop()
+        self.name.pop()
+        return moved
+
+
+# Same interface as StudentStore, backed by StudentColumns, and with no
+# per-student objects in the indexes either:
+#   row_of   one int per possible code (1000-9999), the code's row number
+#            or -1. A fixed 40 KB, however many students there are.
+#   names    a sorted array of name_hash * RANK_SCALE + code, one int per
+#            student, searched and kept in order like the ranking. Names
+#            that share a hash are told apart by checking the row itself.
+# With the ranking that is about 45 bytes a student plus the name string,
+# which students with the same name share. Deleting moves the last row into
+# the gap, so the saved file is not kept in add order.
+class ColumnarStudentStore(StudentStore):
+    def reset(self):
+        self.columns = StudentColumns()
+        self.row_of = array("i", [-1]) * RANK_SCALE
+        self.names = array("q")
+        self.ranking = array("i")
+
+    # row number for a code string, or -1
+    def row_number(self, code):
+        number = code_number(code)
+        return -1 if number is None else self.row_of[number]
+
+    def name_hash(self, name):
+        return hash(name.casefold()) & ((1 << NAME_HASH_BITS) - 1)
+
+    # adds the name to the index and returns it, or the string an earlier
+    # row already holds for the same name, so repeated names share one
+    def name_add(self, name, number):
+        low = self.name_hash(name) * RANK_SCALE
+        first = bisect_left(self.names, low)
+        if first < len(self.names) and self.names[first] < low + RANK_SCALE:
+            same = self.columns.name[self.row_of[self.names[first] % RANK_SCALE]]
+            if same == name:
+                name = same
+        self.names.insert(bisect_left(self.names, low + number, first), low + number)
+        return name
+
+    def name_remove(self, name, number):
+        del self.names[bisect_left(self.names, self.name_hash(name) * RANK_SCALE + number)]
+
+    def index(self, student):
+        number = int(student["code"])
+        i = self.columns.append(student)
+        self.columns.name[i] = self.name_add(student["name"], number)
+        self.row_of[number] = i
+        self.rank_add(number, self.columns.total[i])
+
+    def has(self, code):
+        return self.row_number(code) >= 0
+
+    def all_rows(self):
+        return self.columns
+
+    def get(self, code):
+        self.refresh()
+        return self.record(code) if self.has(code) else None
+
+    # code matches first, then name matches in code order
+    def find(self, key):
+        self.refresh()
+        key = key.strip()
+
+        i = self.row_number(key)
+        if i >= 0:
+            return [self.columns.row(i)]
+
+        folded = key.casefold()
+        low = self.name_hash(key) * RANK_SCALE
+        start = bisect_left(self.names, low)
+        end = bisect_left(self.names, low + RANK_SCALE)
+        rows = [self.row_of[k % RANK_SCALE] for k in self.names[start:end]]
+        return [self.columns.row(i) for i in rows
+                if self.columns.name[i].casefold() == folded]
+
+    def remove(self, code):
+        number = int(code)
+        i = self.row_of[number]
+        student = self.columns.row(i)
+        self.rank_remove(number, student["total"])
+        self.name_remove(student["name"], number)
+        self.row_of[number] = -1
+
+        moved = self.columns.remove(i)
+        if moved is not None:
+            self.row_of[moved] = i
+        return student
+
+    def set_marks(self, code, c1, c2, c3, exam):
+        i = self.row_number(code)
+        self.rank_remove(code, self.columns.total[i])
+        self.columns.set_marks(i, c1, c2, c3, exam)
+        self.rank_add(code, self.columns.total[i])
+
+    def record(self, code):
+        i = self.row_number(code)
+        if i < 0:
+            raise KeyError(code)
+        return self.columns.row(i)
+
+# CODE FOR THE SQLITE STUDENT STORE
+
+STUDENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    code INTEGER NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    c1 INTEGER NOT NULL,
+    c2 INTEGER NOT NULL,
+    c3 INTEGER NOT NULL,
+    exam INTEGER NOT NULL,
+    total INTEGER GENERATED ALWAYS AS (c1 + c2 + c3 + exam) STORED
+);
+CREATE INDEX IF NOT EXISTS students_by_name ON students (name_key);
+CREATE INDEX IF NOT EXISTS students_by_total ON students (total, code);
+"""
+
+STUDENT_COLUMNS = "code, name, c1, c2, c3, exam, total"
+
+
+def student_from_row(row):
+    code, name, c1, c2, c3, exam, total = row
+    return {
+        "code": str(code),
+        "name": name,
+        "c1": c1,
+        "c2": c2,
+        "c3": c3,
+        "exam": exam,
+        "total": total,
+        "percent": total / MAX_TOTAL * 100,
+        "grade": grade_for_total(total)
+    }
+
+
+def open_database(db_name):
+    db = sqlite3.connect(db_name)
+    db.executescript(STUDENT_SCHEMA)
+    return db
+
+
+def insert_row(db, s):
+    db.execute("INSERT INTO students (code, name, name_key, c1, c2, c3, exam) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?)",
+               (int(s["code"]), s["name"], s["name"].casefold(),
+                s["c1"], s["c2"], s["c3"], s["exam"]))
+
+
+# One-shot copy of a marks file into the database, in a single transaction.
+# Returns the LoadReport; rows whose code is already in the database are
+# reported and skipped.
+def import_text_to_sqlite(file_name=FILE_NAME, db_name=DB_NAME):
+    report = LoadReport(file_name)
+    db = open_database(db_name)
+    try:
+        with db:
+            for chunk in iter_student_chunks(file_name, report):
+                for line_no, s in chunk:
+                    try:
+                        insert_row(db, s)
+                        report.loaded += 1
+                    except sqlite3.IntegrityError:
+                        report.add_error(line_no, s["code"], "duplicate code, first row kept")
+    finally:
+        db.close()
+    return report
+
+
+def export_sqlite_to_text(db_name=DB_NAME, file_name=FILE_NAME):
+    db = open_database(db_name)
+    try:
+        rows = db.execute(f"SELECT {STUDENT_COLUMNS} FROM students ORDER BY rowid")
+        students = [student_from_row(row) for row in rows]
+    finally:
+        db.close()
+    save_students(students, file_name)
+    return len(students)
+
+
+# Same interface as StudentStore, but every query runs in SQLite, so
+# nothing is loaded up front. Sorting, searching and ranking use the
+# indexes on code, name_key and total. Each edit is its own transaction.
+# A new database is filled from import_from (the marks file) the first
+# time it is opened.
+class SqliteStudentStore:
+    def __init__(self, db_name=DB_NAME, import_from=None):
+        is_new = not os.path.exists(db_name)
+        self.db_name = db_name
+        self.import_from = import_from if is_new else None
+        self.db = open_database(db_name)
+        self.loaded = False
+        self.loading = False
+        self.report = None
+        self.on_load = None
+
+    def select(self, where="", params=(), order="rowid", limit=None):
+        sql = f"SELECT {STUDENT_COLUMNS} FROM students {where} ORDER BY {order}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [student_from_row(row) for row in self.db.execute(sql, params)]
+
+    def refresh(self):
+        if not self.loaded:
+            for _ in self.load_in_chunks():
+                pass
+
+    def load_in_chunks(self):
+        self.loading = True
+        try:
+            imported = self.import_from is not None
+            if imported:
+                self.db.close()
+                report = import_text_to_sqlite(self.import_from, self.db_name)
+                self.db = open_database(self.db_name)
+                self.import_from = None
+            else:
+                report = LoadReport(self.db_name)
+
+            cursor = self.db.execute(f"SELECT {STUDENT_COLUMNS} FROM students ORDER BY rowid")
+            while True:
+                rows = cursor.fetchmany(CHUNK_SIZE)
+                if not rows:
+                    break
+                if not imported:
+                    report.loaded += len(rows)
+                yield [student_from_row(row) for row in rows]
+        finally:
+            self.loading = False
+
+        self.loaded = True
+        self.report = report
+        if self.on_load is not None:
+            self.on_load(report)
+
+    def all(self):
+        self.refresh()
+        return self.select()
+
+    def all_rows(self):
+        return self.select()
+
+    # None for a code that is not stored, or could not be a code at all
+    def record(self, code):
+        number = code_number(code)
+        if number is None:
+            return None
+        rows = self.select("WHERE code = ?", (number,))
+        return rows[0] if rows else None
+
+    # a few hundred codes per query rather than a query per code
+    def records(self, codes):
+        codes = list(codes)
+        found = {}
+        for start in range(0, len(codes), 500):
+            batch = codes[start:start + 500]
+            marks = ", ".join("?" * len(batch))
+            for s in self.select(f"WHERE code IN ({marks})", [int(c) for c in batch]):
+                found[s["code"]] = s
+        return [found[code] for code in codes]
+
+    def get(self, code):
+        self.refresh()
+        return self.record(code)
+
+    def find(self, key):
+        self.refresh()
+        key = key.strip()
+
+        student = self.get(key)
+        if student:
+            return [student]
+        return self.select("WHERE name_key = ?", (key.casefold(),))
+
+    def add(self, student):
+        self.refresh()
+        try:
+            with self.db:
+                insert_row(self.db, student)
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def delete(self, code):
+        self.refresh()
+        student = self.get(code)
+        if student is None:
+            return None
+
+        with self.db:
+            self.db.execute("DELETE FROM students WHERE code = ?", (int(code),))
+        return student
+
+    def update_marks(self, student, c1, c2, c3, exam):
+        with self.db:
+            self.db.execute("UPDATE students SET c1 = ?, c2 = ?, c3 = ?, exam = ? "
+                            "WHERE code = ?", (c1, c2, c3, exam, int(student["code"])))
+        student.update(self.record(student["code"]))
+
+    # same as StudentStore.bulk_import, as one transaction
+    def bulk_import(self, chunks, report, upsert=True):
+        self.refresh()
+        with self.db:
+            for chunk in chunks:
+                for line_no, s in chunk:
+                    report.loaded += 1
+                    code = int(s["code"])
+                    exists = self.db.execute("SELECT 1 FROM students WHERE code = ?",
+                                             (code,)).fetchone()
+                    if exists is None:
+                        insert_row(self.db, s)
+                        report.added += 1
+                    elif upsert:
+                        self.db.execute(
+                            "UPDATE students SET name = ?, name_key = ?, c1 = ?, c2 = ?, "
+                            "c3 = ?, exam = ? WHERE code = ?",
+                            (s["name"], s["name"].casefold(), s["c1"], s["c2"],
+                             s["c3"], s["exam"], code))
+                        report.updated += 1
+                    else:
+                        report.skipped += 1
+        return report
+
+    def highest(self):
+        rows = self.top(1)
+        return rows[0] if rows else None
+
+    def lowest(self):
+        rows = self.bottom(1)
+        return rows[0] if rows else None
+
+    def top(self, k):
+        self.refresh()
+        return self.select(order="total DESC, code DESC", limit=k) if k > 0 else []
+
+    def bottom(self, k):
+        self.refresh()
+        return self.select(order="total, code", limit=k) if k > 0 else []
+
+    def percentile_rank(self, code):
+        self.refresh()
+        below, count = self.db.execute(
+            "SELECT (SELECT COUNT(*) FROM students WHERE total < "
+            "(SELECT total FROM students WHERE code = ?)), COUNT(*) FROM students",
+            (int(code),)).fetchone()
+        return below / count * 100
+
+    def between(self, low, high):
+        self.refresh()
+        low_total = math.ceil(low * MAX_TOTAL / 100 - 1e-9)
+        high_total = math.floor(high * MAX_TOTAL / 100 + 1e-9)
+        return self.select("WHERE total BETWEEN ? AND ?", (low_total, high_total),
+                           order="total, code")
+
+    def sorted_by_percentage(self, descending=False):
+        self.refresh()
+        return self.select(order="total DESC, code DESC" if descending else "total, code")
+
+    # edits are committed as they happen, so there is nothing to write back
+    def flush(self):
+        pass
+
+    def close(self):
+        self.db.close()
+
+
+def open_store(scheduler=None):
+    if STORAGE == "sqlite":
+        return SqliteStudentStore(DB_NAME, import_from=FILE_NAME)
+    return (ColumnarStudentStore if COLUMNAR else StudentStore)(scheduler=scheduler)
+
+
+# CODE FOR SEARCH
+
+# Substring search over the codes and names of a list of students, used by
+# the search box. Every "code name" key is case-folded once, up front, and
+# joined into one string so a fresh search is a run of str.find() calls;
+# starts[i] is where row i begins. When the query just grows (another
+# letter typed), only the previous hits are checked again.
+class SearchIndex:
+    def __init__(self, codes, names):
+        self.codes = list(codes)
+        self.keys = [f"{code} {name.casefold()}" for code, name in zip(self.codes, names)]
+        self.starts = array("i")
+        offset = 0
+        for key in self.keys:
+            self.starts.append(offset)
+            offset += len(key) + 1
+        self.text = "\n".join(self.keys) + "\n"
+        self.last_query = ""
+        self.last_hits = None
+
+    def search(self, query):
+        query = query.strip().casefold()
+        if not query or "\n" in query:
+            self.last_query, self.last_hits = "", None
+            return list(self.codes) if not query else []
+
+        if self.last_hits is not None and query.startswith(self.last_query):
+            hits = [i for i in self.last_hits if query in self.keys[i]]
+        else:
+            hits = self.scan(query)
+
+        self.last_query, self.last_hits = query, hits
+        return [self.codes[i] for i in hits]
+
+    def scan(self, query):
+        hits = []
+        pos = self.text.find(query)
+        while pos != -1:
+            row = bisect_right(self.starts, pos) - 1
+            hits.append(row)
+            if row + 1 == len(self.starts):
+                break
+            pos = self.text.find(query, self.starts[row + 1])
+        return hits
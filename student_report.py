@@ -0,0 +1,273 @@
+# Command line reports over one or many student marks files, no window
+# needed. For example:
+#
+#   python student_report.py report studentMarks.txt
+#   python student_report.py report classes/ --top 5 --format csv -o report.csv
+#   python student_report.py import studentMarks.txt studentMarks.db
+#   python student_report.py export studentMarks.db studentMarks.txt
+#
+# Each file is streamed in chunks and boiled down to a ClassStats, which
+# only holds a histogram of totals and the current top/bottom k. Memory use
+# is the same for 10 students or 10 million. Files are spread over a pool
+# of worker processes.
+
+import argparse
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from student_data import (DB_NAME, FILE_NAME, MAX_TOTAL, LoadReport, export_sqlite_to_text,
+                          grade_for_total, import_text_to_sqlite, iter_student_chunks)
+
+GRADES = ("A", "B", "C", "D", "F")
+
+# CODE FOR CLASS STATISTICS
+
+# Totals are whole numbers from 0 to MAX_TOTAL, so counting how many
+# students got each total is enough to give an exact mean, median and
+# standard deviation. The top and bottom k are kept in heaps of size k.
+class ClassStats:
+    def __init__(self, name, k=3):
+        self.name = name
+        self.k = k
+        self.histogram = [0] * (MAX_TOTAL + 1)
+        self.count = 0
+        self.bad_rows = 0
+        self.problems = ""
+        self.best = []      # min-heap of (total, code, name)
+        self.worst = []     # min-heap of (-total, -code, name)
+
+    def add(self, s):
+        total = s["c1"] + s["c2"] + s["c3"] + s["exam"]
+        code = int(s["code"])
+        self.histogram[total] += 1
+        self.count += 1
+
+        self.keep(self.best, (total, code, s["name"]))
+        self.keep(self.worst, (-total, -code, s["name"]))
+
+    def keep(self, heap, item):
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif self.k:
+            heapq.heappushpop(heap, item)
+
+    def merge(self, other):
+        for total, n in enumerate(other.histogram):
+            self.histogram[total] += n
+        self.count += other.count
+        self.bad_rows += other.bad_rows
+        for item in other.best:
+            self.keep(self.best, item)
+        for item in other.worst:
+            self.keep(self.worst, item)
+
+    def mean(self):
+        if not self.count:
+            return 0.0
+        return sum(t * n for t, n in enumerate(self.histogram)) / self.count / MAX_TOTAL * 100
+
+    def median(self):
+        if not self.count:
+            return 0.0
+
+        # the two middle totals (the same one when count is odd)
+        middle = ((self.count - 1) // 2, self.count // 2)
+        found = []
+        seen = 0
+        for total, n in enumerate(self.histogram):
+            while len(found) < 2 and middle[len(found)] < seen + n:
+                found.append(total)
+            seen += n
+        return (found[0] + found[1]) / 2 / MAX_TOTAL * 100
+
+    # population standard deviation of the percentages
+    def stdev(self):
+        if not self.count:
+            return 0.0
+        mean = self.mean()
+        square_sum = sum(n * (t / MAX_TOTAL * 100 - mean) ** 2
+                         for t, n in enumerate(self.histogram))
+        return math.sqrt(square_sum / self.count)
+
+    def grade_counts(self):
+        counts = dict.fromkeys(GRADES, 0)
+        for total, n in enumerate(self.histogram):
+            counts[grade_for_total(total)] += n
+        return counts
+
+    def top(self):
+        return [student_entry(total, code, name)
+                for total, code, name in sorted(self.best, reverse=True)]
+
+    def bottom(self):
+        return [student_entry(-total, -code, name)
+                for total, code, name in sorted(self.worst, reverse=True)]
+
+    def as_dict(self):
+        return {
+            "file": self.name,
+            "students": self.count,
+            "bad_rows": self.bad_rows,
+            "mean": round(self.mean(), 2),
+            "median": round(self.median(), 2),
+            "stdev": round(self.stdev(), 2),
+            "grades": self.grade_counts(),
+            "top": self.top(),
+            "bottom": self.bottom(),
+            "problems": self.problems
+        }
+
+
+def student_entry(total, code, name):
+    return {"code": str(code), "name": name, "percent": round(total / MAX_TOTAL * 100, 2)}
+
+
+def summarise_file(file_name, k=3):
+    stats = ClassStats(file_name, k)
+    report = LoadReport(file_name)
+    seen = bytearray(10000)     # codes are 1000-9999
+
+    for chunk in iter_student_chunks(file_name, report):
+        for line_no, s in chunk:
+            code = int(s["code"])
+            if seen[code]:
+                report.add_error(line_no, s["code"], "duplicate code, first row kept")
+                continue
+            seen[code] = 1
+            stats.add(s)
+
+    report.loaded = stats.count
+    stats.bad_rows = len(report.errors)
+    if report.has_problems():
+        stats.problems = report.summary()
+    return stats
+
+
+def summarise_files(file_names, k=3, workers=None):
+    if workers == 1 or len(file_names) < 2:
+        return [summarise_file(name, k) for name in file_names]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(file_names) // ((workers or os.cpu_count() or 1) * 4))
+        return list(pool.map(summarise_file, file_names, repeat(k), chunksize=chunksize))
+
+
+def combined(results, k=3):
+    total = ClassStats("ALL FILES", k)
+    for stats in results:
+        total.merge(stats)
+    return total
+
+# CODE FOR OUTPUT
+
+def format_students(entries):
+    return ", ".join(f"{e['code']} {e['name']} {e['percent']:.2f}%" for e in entries)
+
+
+def write_text(rows, out):
+    for row in rows:
+        out.write(f"{row['file']}: {row['students']} students ({row['bad_rows']} bad rows)\n")
+        out.write(f"  mean {row['mean']:.2f}%  median {row['median']:.2f}%  "
+                  f"stdev {row['stdev']:.2f}\n")
+        out.write("  grades  " + "  ".join(f"{g} {n}" for g, n in row["grades"].items()) + "\n")
+        out.write(f"  top: {format_students(row['top'])}\n")
+        out.write(f"  bottom: {format_students(row['bottom'])}\n\n")
+
+
+def write_csv(rows, out):
+    writer = csv.writer(out)
+    writer.writerow(["file", "students", "bad_rows", "mean", "median", "stdev",
+                     *GRADES, "top", "bottom"])
+    for row in rows:
+        writer.writerow([row["file"], row["students"], row["bad_rows"],
+                         row["mean"], row["median"], row["stdev"],
+                         *(row["grades"][g] for g in GRADES),
+                         format_students(row["top"]), format_students(row["bottom"])])
+
+
+def write_json(rows, out):
+    json.dump(rows, out, indent=2)
+    out.write("\n")
+
+
+WRITERS = {"text": write_text, "csv": write_csv, "json": write_json}
+
+# CODE FOR THE COMMAND LINE
+
+# directories stand for every .txt file inside them
+def expand_paths(paths):
+    file_names = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_names.extend(sorted(os.path.join(path, f) for f in os.listdir(path)
+                                     if f.endswith(".txt")))
+        else:
+            file_names.append(path)
+    return file_names
+
+
+def run_report(args):
+    file_names = expand_paths(args.files)
+    results = summarise_files(file_names, args.top, args.workers)
+
+    rows = [stats.as_dict() for stats in results]
+    if len(results) > 1:
+        rows.append(combined(results, args.top).as_dict())
+
+    for stats in results:
+        if stats.problems:
+            print(stats.problems, file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            WRITERS[args.format](rows, out)
+    else:
+        WRITERS[args.format](rows, sys.stdout)
+
+
+def run_import(args):
+    report = import_text_to_sqlite(args.file, args.db)
+    print(report.summary())
+
+
+def run_export(args):
+    count = export_sqlite_to_text(args.db, args.file)
+    print(f"Wrote {count} students to {args.file}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reports over student marks files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="grade statistics for one or more files")
+    report.add_argument("files", nargs="+", help="marks files, or folders of .txt files")
+    report.add_argument("-k", "--top", type=int, default=3,
+                        help="how many top and bottom students to list (default 3)")
+    report.add_argument("-f", "--format", choices=sorted(WRITERS), default="text")
+    report.add_argument("-o", "--output", help="write here instead of the screen")
+    report.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    report.set_defaults(run=run_report)
+
+    to_db = commands.add_parser("import", help="copy a marks file into a SQLite database")
+    to_db.add_argument("file", nargs="?", default=FILE_NAME)
+    to_db.add_argument("db", nargs="?", default=DB_NAME)
+    to_db.set_defaults(run=run_import)
+
+    from_db = commands.add_parser("export", help="write a SQLite database out as a marks file")
+    from_db.add_argument("db", nargs="?", default=DB_NAME)
+    from_db.add_argument("file", nargs="?", default=FILE_NAME)
+    from_db.set_defaults(run=run_export)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
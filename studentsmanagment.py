@@ -1,172 +1,483 @@
 import tkinter as tk
-from tkinter import messagebox, simpledialog, ttk
-import os
+from tkinter import filedialog, messagebox, simpledialog, ttk
+from itertools import islice
+from operator import itemgetter
 
-FILE_NAME = "studentMarks.txt"
+from student_data import (ImportReport, SearchIndex, iter_line_chunks, mark, open_store,
+                          parse_student)
 
-# CODE FOR FILE HANDLING
-
-def load_students():
-    students = []
+# CODE FOR TABLE DISPLAY FUNCTIONS
 
-    if not os.path.exists(FILE_NAME):
-        messagebox.showerror("Error", "studentMarks.txt file not found")
-        return students
+# Each row's item id is the student's code, so after an edit the one row it
+# touches can be found and changed in place (see table_added/_updated/
+# _deleted) instead of rebuilding the whole table.
+#
+# Big rosters are put in the table ROW_BATCH rows at a time from root.after(),
+# so the window keeps redrawing and answering clicks while a long list
+# fills in. table_version changes whenever the table is cleared, which tells
+# any batches still queued for the old contents to stop.
+#
+# The search box hides rows rather than deleting them: table_order keeps
+# every row in display order, and visible is the part currently attached
+# (the whole of table_order unless a search is active).
+#
+# Only codes are kept here. Searching and sorting ask the store for the
+# records when they need them, so the columnar store's saving is not lost
+# to a dict per row held by the window.
+ROW_BATCH = 500
+SEARCH_DELAY = 150  # ms of typing pause before the table is filtered
+
+table_version = 0
+showing_all = False     # True while the table lists the whole roster
+table_order = []
+shown_codes = set()     # every code in table_order
+visible = table_order
+search_index = None
+search_job = None
+stripe_version = 0
 
-    with open(FILE_NAME, "r") as file:
-        lines = file.readlines()
+def clear_table():
+    global table_version, showing_all, table_order, shown_codes, visible, search_index
+    table_version += 1
+    showing_all = False
+    # get_children() leaves out the rows a search has detached
+    student_table.delete(*shown_codes)
+
+    table_order = []
+    shown_codes = set()
+    visible = table_order
+    search_index = None
+    search_var.set("")
+    sort_cache.clear()
+    show_sort_arrow(None, False)
+
+
+def student_values(s):
+    return (
+        s["code"],
+        s["name"],
+        s["c1"],
+        s["c2"],
+        s["c3"],
+        s["exam"],
+        s["total"],
+        f"{s['percent']:.2f}%",
+        s["grade"]
+    )
 
-    for line in lines[1:]:
-        parts = line.strip().split(",")
+def row_tag(position):
+    return "evenrow" if position % 2 == 0 else "oddrow"
 
-        student = {
-            "code": parts[0],
-            "name": parts[1],
-            "c1": int(parts[2]),
-            "c2": int(parts[3]),
-            "c3": int(parts[4]),
-            "exam": int(parts[5])
-        }
+def insert_student(s):
+    global search_index
+    code = s["code"]
 
-        students.append(student)
+    student_table.insert("", tk.END, iid=code, values=student_values(s),
+                         tags=(row_tag(len(table_order)),))
 
-    return students
+    table_order.append(code)
+    shown_codes.add(code)
+    search_index = None
+    sort_cache.clear()
+    if visible is not table_order:
+        schedule_search()
 
 
-def save_students(students):
-    with open(FILE_NAME, "w") as file:
-        file.write(str(len(students)) + "\n")
-        for s in students:
-            line = f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n"
-            file.write(line)
+# recolour codes[start:] to match their position, a batch at a time
+def restripe(codes, start=0):
+    global stripe_version
+    stripe_version += 1
+    version = stripe_version
 
-# CODE FOR MARK CALCULATIONS
+    def step(first):
+        if version != stripe_version:
+            return
+        end = min(first + ROW_BATCH, len(codes))
+        for i in range(first, end):
+            student_table.item(codes[i], tags=(row_tag(i),))
+        if end < len(codes):
+            root.after(1, step, end)
 
-def total_mark(s):
-    return s["c1"] + s["c2"] + s["c3"] + s["exam"]
+    step(start)
 
-def percentage(s):
-    return (total_mark(s) / 160) * 100
 
-def grade(p):
-    if p >= 70: return "A"
-    elif p >= 60: return "B"
-    elif p >= 50: return "C"
-    elif p >= 40: return "D"
-    else: return "F"
+# a new student only belongs in the table when it lists everyone
+def table_added(s):
+    if showing_all and s["code"] not in shown_codes:
+        insert_student(s)
 
-# CODE FOR TABLE DISPLAY FUNCTIONS
+def table_updated(s):
+    if s["code"] in shown_codes:
+        student_table.item(s["code"], values=student_values(s))
+        # codes and names did not change, so those orders still hold
+        for column in MARK_COLUMNS:
+            sort_cache.pop(column, None)
+
+def table_deleted(code):
+    global search_index
+    if code not in shown_codes:
+        return
+
+    position = visible.index(code) if code in visible else None
+    student_table.delete(code)
+    shown_codes.remove(code)
+    table_order.remove(code)
+    if visible is not table_order and position is not None:
+        del visible[position]
+    search_index = None
+    for ascending in sort_cache.values():
+        ascending.remove(code)
+
+    # only the rows below the gap change colour
+    if position is not None:
+        restripe(visible, position)
+
+
+def show_students(students):
+    clear_table()
+    version = table_version
+    # a snapshot, so edits made between batches can't upset the iteration
+    rows = iter(list(students))
 
-def clear_table():
-    global row_count
-    row_count = 0
-    for row in student_table.get_children():
-        student_table.delete(row)
+    def step():
+        if version != table_version:
+            return
 
+        count = 0
+        for s in islice(rows, ROW_BATCH):
+            insert_student(s)
+            count += 1
+        if count == ROW_BATCH:
+            root.after(1, step)
 
-row_count = 0
+    step()
 
-def insert_student(s):
-    global row_count
+# CODE FOR LIVE SEARCH
 
-    tag = "evenrow" if row_count % 2 == 0 else "oddrow"
+def schedule_search(*args):
+    global search_job
+    if search_job is not None:
+        root.after_cancel(search_job)
+    search_job = root.after(SEARCH_DELAY, apply_search)
 
-    student_table.insert("", tk.END, values=(
-        s["code"],
-        s["name"],
-        s["c1"],
-        s["c2"],
-        s["c3"],
-        s["exam"],
-        total_mark(s),
-        f"{percentage(s):.2f}%",
-        grade(percentage(s))
-    ), tags=(tag,))
+def apply_search():
+    global search_job, search_index, visible
+    search_job = None
+    query = search_var.get()
 
-    row_count += 1
+    if not query.strip():
+        if visible is table_order:
+            return
+        visible = table_order
+    else:
+        if search_index is None:
+            names = [s["name"] for s in store.records(table_order)]
+            search_index = SearchIndex(table_order, names)
+        visible = search_index.search(query)
+
+    # one call re-attaches the matches and detaches everything else
+    student_table.set_children("", *visible)
+    restripe(visible)
+
+# CODE FOR COLUMN SORTING
+
+# Clicking a heading sorts the rows in the table by that column; clicking it
+# again flips the direction. The ascending order of codes for each column
+# is kept in sort_cache until the rows change, so a repeat click or a flip
+# only reorders the existing items. Percent and Grade sort by total, so on
+# every mark column ascending means lowest score first (F before A).
+SORT_KEYS = {
+    "Code": lambda s: int(s["code"]),
+    "Name": lambda s: s["name"].casefold(),
+    "C1": itemgetter("c1"),
+    "C2": itemgetter("c2"),
+    "C3": itemgetter("c3"),
+    "Exam": itemgetter("exam"),
+    "Total": itemgetter("total"),
+    "Percent": itemgetter("total"),
+    "Grade": itemgetter("total")
+}
+MARK_COLUMNS = ("C1", "C2", "C3", "Exam", "Total", "Percent", "Grade")
+
+sort_cache = {}
+sort_column = None
+sort_descending = False
+
+def sort_by_column(column):
+    global sort_column, sort_descending, table_order, visible, search_index
+    sort_descending = column == sort_column and not sort_descending
+    sort_column = column
+
+    ascending = sort_cache.get(column)
+    if ascending is None:
+        key = SORT_KEYS[column]
+        keys = dict(zip(table_order, map(key, store.records(table_order))))
+        ascending = sorted(table_order, key=keys.__getitem__)
+        sort_cache[column] = ascending
+    order = ascending[::-1] if sort_descending else list(ascending)
+
+    # a search stays applied, just in the new order
+    if visible is table_order:
+        visible = order
+    else:
+        wanted = set(visible)
+        visible = [code for code in order if code in wanted]
+    table_order = order
+    search_index = None
+
+    student_table.set_children("", *visible)
+    restripe(visible)
+    show_sort_arrow(column, sort_descending)
+
+def show_sort_arrow(column, descending):
+    global sort_column
+    sort_column = column
+    for col, text in heading_text.items():
+        if col == column:
+            text += " ▼" if descending else " ▲"
+        student_table.heading(col, text=text)
 
 #CODE FOR BUTTON FUNCTIONS
 
 def view_all():
-    students = load_students()
+    global showing_all
+    show_students(store.all())
+    showing_all = True
+
+# first load: put each chunk in the table as soon as it is parsed
+def load_table():
+    global showing_all
+    chunks = store.load_in_chunks()
     clear_table()
-    for s in students:
-        insert_student(s)
+    showing_all = True
+    version = table_version
+
+    def step():
+        chunk = next(chunks, None) or ()
+        # keep loading even if another view has taken over the table
+        if version == table_version:
+            for s in chunk:
+                insert_student(s)
+        if store.loading:
+            root.after(1, step)
+        # the journal is replayed after the last chunk, so the rows already
+        # shown may have been changed or deleted since
+        elif version == table_version and store.report.replayed:
+            view_all()
+
+    step()
+
+def show_load_report(report):
+    if report.missing:
+        messagebox.showerror("Error", report.summary())
+    elif report.has_problems():
+        messagebox.showwarning("Problems in marks file", report.summary())
+
+# when a name matches several students, ask which one by code
+def choose_student(matches, title):
+    if len(matches) <= 1:
+        return matches[0] if matches else None
+
+    listing = "\n".join(f"{s['code']}  {s['name']}" for s in matches)
+    code = simpledialog.askstring(title, f"{len(matches)} students share that name:\n\n"
+                                         f"{listing}\n\nEnter the Code to use:")
+    for s in matches:
+        if s["code"] == code:
+            return s
+    return None
 
 def view_individual():
-    students = load_students()
     key = simpledialog.askstring("Search", "Enter Name or Code:")
+    if not key:
+        return
 
+    matches = store.find(key)
     clear_table()
-    for s in students:
-        if s["code"] == key or s["name"].lower() == key.lower():
-            insert_student(s)
-            return
+    for s in matches:
+        insert_student(s)
 
-    messagebox.showerror("Not Found", "Student not found")
+    if not matches:
+        messagebox.showerror("Not Found", "Student not found")
 
 def show_highest():
-    students = load_students()
-    best = max(students, key=percentage)
+    best = store.highest()
+    if best is None:
+        return
     clear_table()
     insert_student(best)
 
 def show_lowest():
-    students = load_students()
-    worst = min(students, key=percentage)
+    worst = store.lowest()
+    if worst is None:
+        return
     clear_table()
     insert_student(worst)
 
-def sort_students():
-    students = load_students()
-    order = simpledialog.askstring("Sort", "Type ASC or DESC:")
-    students.sort(key=percentage, reverse=(order and order.upper() == "DESC"))
+def ask_count(title):
+    return simpledialog.askinteger(title, "How many students?", minvalue=1)
+
+def show_top():
+    k = ask_count("Top Students")
+    if k:
+        show_students(store.top(k))
+
+def show_bottom():
+    k = ask_count("Bottom Students")
+    if k:
+        show_students(store.bottom(k))
+
+def show_percentile():
+    key = simpledialog.askstring("Percentile Rank", "Enter Name or Code:")
+    if not key:
+        return
+
+    student = choose_student(store.find(key), "Percentile Rank")
+    if student is None:
+        messagebox.showerror("Not Found", "Student not found")
+        return
 
     clear_table()
-    for s in students:
-        insert_student(s)
+    insert_student(student)
+    rank = store.percentile_rank(student["code"])
+    messagebox.showinfo("Percentile Rank",
+                        f"{student['name']} scored higher than {rank:.1f}% of the class")
+
+def show_range():
+    low = simpledialog.askfloat("Score Range", "Lowest percentage:", minvalue=0, maxvalue=100)
+    if low is None:
+        return
+    high = simpledialog.askfloat("Score Range", "Highest percentage:", minvalue=low, maxvalue=100)
+    if high is None:
+        return
+
+    students = store.between(low, high)
+    show_students(students)
+    if not students:
+        messagebox.showinfo("Score Range", f"No students scored between {low:g}% and {high:g}%")
 
-def add_student():
-    students = load_students()
+def sort_students():
+    order = simpledialog.askstring("Sort", "Type ASC or DESC:")
+    students = store.sorted_by_percentage(descending=bool(order and order.upper() == "DESC"))
+    show_students(students)
 
+def add_student():
     code = simpledialog.askstring("Add", "Enter Code:")
     name = simpledialog.askstring("Add", "Enter Name:")
-    c1 = int(simpledialog.askstring("Add", "Coursework 1:"))
-    c2 = int(simpledialog.askstring("Add", "Coursework 2:"))
-    c3 = int(simpledialog.askstring("Add", "Coursework 3:"))
-    exam = int(simpledialog.askstring("Add", "Exam:"))
-
-    students.append({"code": code, "name": name, "c1": c1, "c2": c2, "c3": c3, "exam": exam})
-    save_students(students)
+    c1 = simpledialog.askstring("Add", "Coursework 1:")
+    c2 = simpledialog.askstring("Add", "Coursework 2:")
+    c3 = simpledialog.askstring("Add", "Coursework 3:")
+    exam = simpledialog.askstring("Add", "Exam:")
+
+    # same rules as a row in the marks file
+    try:
+        student = parse_student(f"{code},{name},{c1},{c2},{c3},{exam}")
+    except ValueError as e:
+        messagebox.showerror("Error", f"Student not added: {e}")
+        return
+
+    code = student["code"]
+    if not store.add(student):
+        messagebox.showerror("Error", f"A student with code {code} already exists")
+        return
 
     messagebox.showinfo("Success", "Student Added Successfully")
-    view_all()
+    table_added(store.get(code))
 
 def delete_student():
-    students = load_students()
     key = simpledialog.askstring("Delete", "Enter Name or Code:")
+    if not key:
+        return
 
-    students = [s for s in students if s["code"] != key and s["name"].lower() != key.lower()]
-    save_students(students)
+    student = choose_student(store.find(key), "Delete")
+    if student is None:
+        messagebox.showerror("Not Found", "Student not found")
+        return
+
+    store.delete(student["code"])
 
     messagebox.showinfo("Deleted", "Student Removed")
-    view_all()
+    table_deleted(student["code"])
 
 def update_student():
-    students = load_students()
     key = simpledialog.askstring("Update", "Enter Name or Code:")
-
-    for s in students:
-        if s["code"] == key or s["name"].lower() == key.lower():
-            s["c1"] = int(simpledialog.askstring("Update", "New Coursework 1:"))
-            s["c2"] = int(simpledialog.askstring("Update", "New Coursework 2:"))
-            s["c3"] = int(simpledialog.askstring("Update", "New Coursework 3:"))
-            s["exam"] = int(simpledialog.askstring("Update", "New Exam Mark:"))
-            save_students(students)
-
-            messagebox.showinfo("Updated", "Student Record Updated")
-            view_all()
+    if not key:
+        return
+
+    student = choose_student(store.find(key), "Update")
+    if student:
+        try:
+            c1 = mark(simpledialog.askstring("Update", "New Coursework 1:"), "coursework 1", 20)
+            c2 = mark(simpledialog.askstring("Update", "New Coursework 2:"), "coursework 2", 20)
+            c3 = mark(simpledialog.askstring("Update", "New Coursework 3:"), "coursework 3", 20)
+            exam = mark(simpledialog.askstring("Update", "New Exam Mark:"), "exam", 100)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Student not updated: {e}")
             return
+        store.update_marks(student, c1, c2, c3, exam)
+
+        messagebox.showinfo("Updated", "Student Record Updated")
+        table_updated(student)
+
+# CODE FOR BULK IMPORT
+
+# Merges pasted rows or a whole marks file into the roster in one go: one
+# report at the end and one save, instead of a dialog and a file write per
+# student. The count line at the top is optional.
+def bulk_import():
+    window = tk.Toplevel(root)
+    window.title("Bulk Import")
+    window.configure(bg="#020617")
+    window.transient(root)
+    window.grab_set()
+
+    tk.Label(window, text="Paste rows as code,name,c1,c2,c3,exam or import a marks file",
+             font=("Segoe UI", 11, "bold"), fg="white", bg="#020617").pack(padx=12, pady=(12, 6))
+
+    pasted = tk.Text(window, width=70, height=15, font=("Consolas", 10))
+    pasted.pack(padx=12, pady=6)
+
+    mode = tk.StringVar(value="upsert")
+    modes = tk.Frame(window, bg="#020617")
+    modes.pack(pady=6)
+    for text, value in (("Update existing codes", "upsert"), ("Skip existing codes", "skip")):
+        tk.Radiobutton(modes, text=text, variable=mode, value=value,
+                       font=("Segoe UI", 10), fg="white", bg="#020617",
+                       selectcolor="#1e40af", activebackground="#020617").pack(side="left", padx=10)
+
+    def finish(lines, source):
+        report = ImportReport(source)
+        store.bulk_import(iter_line_chunks(lines, report, header_required=False),
+                          report, upsert=mode.get() == "upsert")
+        window.destroy()
+
+        if report.has_problems():
+            messagebox.showwarning("Bulk Import", report.summary())
+        else:
+            messagebox.showinfo("Bulk Import", report.summary())
+        view_all()
+
+    def import_pasted():
+        finish(pasted.get("1.0", tk.END).splitlines(), "pasted rows")
+
+    def import_file():
+        path = filedialog.askopenfilename(parent=window, title="Marks file to import",
+                                          filetypes=[("Marks files", "*.txt *.csv"),
+                                                     ("All files", "*.*")])
+        if path:
+            with open(path, "r") as file:
+                finish(file, path)
+
+    buttons = tk.Frame(window, bg="#020617")
+    buttons.pack(pady=(6, 12))
+    for text, cmd, colour in (("Import Pasted Rows", import_pasted, "#1e40af"),
+                              ("Import File...", import_file, "#1e40af"),
+                              ("Cancel", window.destroy, "#dc2626")):
+        tk.Button(buttons, text=text, command=cmd, font=("Segoe UI", 10, "bold"),
+                  bg=colour, fg="white", bd=0, padx=14, pady=8).pack(side="left", padx=6)
+
+def exit_system():
+    store.close()
+    root.destroy()
 
 # MAIN WINDOW CODE
 
@@ -174,6 +485,11 @@ root = tk.Tk()
 root.title("Student Management System")
 root.geometry("1300x750")
 root.configure(bg="#0f172a")
+root.protocol("WM_DELETE_WINDOW", exit_system)
+
+# one store for the whole session, saving through root.after()
+store = open_store(scheduler=root)
+store.on_load = show_load_report
 
 #CHANGE ICON CODE
 try:
@@ -194,6 +510,8 @@ home_title.pack(pady=80)
 def enter_system():
     home_frame.pack_forget()
     main_frame.pack(fill="both", expand=True)
+    if not store.loaded:
+        load_table()
 
 enter_btn = tk.Button(home_frame, text="ENTER SYSTEM",
                       font=("Segoe UI", 14, "bold"), bg="#2563eb",
@@ -217,8 +535,8 @@ def styled_button(text, cmd):
     btn = tk.Button(sidebar, text=text, command=cmd,
                     font=("Segoe UI", 11, "bold"),
                     bg="#1e40af", fg="white",
-                    bd=0, pady=14)
-    btn.pack(fill="x", padx=12, pady=6)
+                    bd=0, pady=10)
+    btn.pack(fill="x", padx=12, pady=4)
     btn.bind("<Enter>", lambda e: btn.config(bg="#2563eb"))
     btn.bind("<Leave>", lambda e: btn.config(bg="#1e40af"))
 
@@ -226,15 +544,20 @@ styled_button("View All Students", view_all)
 styled_button("View Individual Student", view_individual)
 styled_button("Highest Score", show_highest)
 styled_button("Lowest Score", show_lowest)
+styled_button("Top Students", show_top)
+styled_button("Bottom Students", show_bottom)
+styled_button("Percentile Rank", show_percentile)
+styled_button("Students in Score Range", show_range)
 styled_button("Sort Records", sort_students)
 styled_button("Add Student", add_student)
 styled_button("Delete Student", delete_student)
 styled_button("Update Student", update_student)
+styled_button("Bulk Import", bulk_import)
 
 exit_btn = tk.Button(sidebar, text="Exit System",
                      bg="#dc2626", fg="white",
                      font=("Segoe UI", 11, "bold"),
-                     bd=0, pady=16, command=root.destroy)
+                     bd=0, pady=16, command=exit_system)
 exit_btn.pack(fill="x", padx=10, pady=30)
 
 #CODE FOR TABLE DISPLAY
@@ -261,6 +584,18 @@ style.map("Treeview.Heading",
 
 columns = ("Code", "Name", "C1", "C2", "C3", "Exam", "Total", "Percent", "Grade")
 
+#CODE FOR SEARCH BOX
+search_bar = tk.Frame(display, bg="white")
+search_bar.pack(fill="x", padx=10, pady=(10, 0))
+
+tk.Label(search_bar, text="Search:", font=("Segoe UI", 11, "bold"),
+         bg="white").pack(side="left")
+
+search_var = tk.StringVar()
+search_entry = tk.Entry(search_bar, textvariable=search_var, font=("Segoe UI", 11))
+search_entry.pack(side="left", fill="x", expand=True, padx=8)
+search_var.trace_add("write", schedule_search)
+
 student_table = ttk.Treeview(display, columns=columns, show="headings", style="Treeview")
 
 student_table.heading("Code", text="Student Code")
@@ -273,6 +608,10 @@ student_table.heading("Total", text="Total")
 student_table.heading("Percent", text="Percentage")
 student_table.heading("Grade", text="Grade")
 
+heading_text = {col: student_table.heading(col, "text") for col in columns}
+for col in columns:
+    student_table.heading(col, command=lambda c=col: sort_by_column(c))
+
 student_table.column("Code", width=110, anchor="center")
 student_table.column("Name", width=200, anchor="w")
 student_table.column("C1", width=80, anchor="center")
@@ -287,8 +626,8 @@ student_table.pack(fill="both", expand=True, padx=10, pady=10)
 
 #CODE FOR ROW COLORS
 
-style.configure("oddrow", background="white")
-style.configure("evenrow", background="#f1f5f9")
+student_table.tag_configure("oddrow", background="white")
+student_table.tag_configure("evenrow", background="#f1f5f9")
 
 
 root.mainloop()